@@ -1,17 +1,27 @@
+import argparse
 import getpass
-import bcrypt
 import json
+import os
+import bcrypt
+from history import Transaction, parse_legacy
+from journal import Journal
+from ledger import DEFAULT_BALANCE, InsufficientFunds, Ledger, check_paise, format_paise, parse_amount, to_paise
+from session import SessionManager
+
+PAGE_SIZE = 10  # transactions per history page
 
 class ATM:
-    def __init__(self):
-        # Load data from file (if available)
-        self.data_file = "atm_data.json"
-        self.balance = 1000  # Default balance
-        self.pin = None  # PIN will be hashed
-        self.transactions = []
-        
+    def __init__(self, data_prefix="atm_data", sessions=None):
+        # State is kept in an append-only journal with periodic snapshots
+        # (see journal.py); older versions rewrote atm_data.json every time
+        self.legacy_file = data_prefix + ".json"
+        self.journal = Journal(data_prefix, {"balance": DEFAULT_BALANCE, "pin": None})  # Paise; PIN hashed
+        self.subject = data_prefix
+        self.sessions = sessions or SessionManager()  # PIN checked once per session (see session.py)
+        self.token = None
+
         self.load_data()  # Load previous data if exists
-        
+
         # If no PIN is set, initialize it
         if self.pin is None:
             self.set_initial_pin()
@@ -24,36 +34,42 @@ class ATM:
             if new_pin == confirm_pin:
                 self.pin = bcrypt.hashpw(new_pin.encode(), bcrypt.gensalt()).decode()
                 print("PIN set successfully!")
-                self.save_data()  # Save to file
+                self.save_data(pin=self.pin)  # Save to file
                 break
             else:
                 print("PINs do not match. Please try again.")
 
-    def save_data(self):
-        """Save balance, PIN, and transactions to a file."""
-        data = {
-            "balance": self.balance,
-            "pin": self.pin,
-            "transactions": self.transactions
-        }
-        with open(self.data_file, "w") as file:
-            json.dump(data, file)
+    def save_data(self, kind=None, amount=0, **changes):
+        """Append one operation (transaction kind/amount and changed fields) to the journal."""
+        self.journal.append(kind, amount, **changes)
 
     def load_data(self):
-        """Load balance, PIN, and transactions from a file if it exists."""
-        try:
-            with open(self.data_file, "r") as file:
-                data = json.load(file)
-                self.balance = data.get("balance", 1000)
-                self.pin = data.get("pin")
-                self.transactions = data.get("transactions", [])
-        except FileNotFoundError:
-            pass  # No data file yet, continue with defaults
+        """Load balance and PIN from the last snapshot plus the journal."""
+        if not os.path.exists(self.journal.snapshot_path) and os.path.exists(self.legacy_file):
+            self.import_legacy()
+        self.balance = self.journal.state["balance"]
+        self.pin = self.journal.state["pin"]
+
+    def import_legacy(self):
+        """Take over the old whole-file atm_data.json once, then rename it to .migrated.
+
+        The whole history is parsed before anything is written, so a file the
+        migration rejects is left untouched.
+        """
+        with open(self.legacy_file, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        state = {"balance": to_paise(data.get("balance", 1000)), "pin": data.get("pin")}
+        transactions = parse_legacy(data.get("transactions", []), state["balance"])
+        self.journal.import_state(state, transactions)
+        os.replace(self.legacy_file, self.legacy_file + ".migrated")
 
     def verify_pin(self):
-        """Prompt user for PIN verification."""
+        """Check the session token; prompt for the PIN (bcrypt) only to start a new session."""
+        if self.sessions.check(self.token, self.subject):
+            return True
         entered_pin = getpass.getpass("Enter your PIN: ")
-        if bcrypt.checkpw(entered_pin.encode(), self.pin.encode()):
+        self.token = self.sessions.open(self.subject, entered_pin, self.pin)
+        if self.token:
             return True
         else:
             print("Incorrect PIN. Access denied.")
@@ -61,37 +77,45 @@ class ATM:
 
     def check_balance(self):
         if self.verify_pin():
-            print(f"Your current balance is: ₹{self.balance}")
-            self.transactions.append("Checked balance")
-            self.save_data()
+            print(f"Your current balance is: {format_paise(self.balance)}")
+            self.save_data("balance")
 
     def deposit(self):
         if self.verify_pin():
             try:
-                amount = float(input("Enter amount to deposit: "))
-                if amount > 0:
-                    self.balance += amount
-                    print(f"₹{amount} deposited successfully!")
-                    self.transactions.append(f"Deposited: ₹{amount}")
-                    self.save_data()
-                else:
-                    print("Invalid deposit amount.")
-            except ValueError:
-                print("Invalid input. Enter a number.")
+                paise = parse_amount(input("Enter amount to deposit: "))
+            except ValueError as error:
+                print(f"Invalid deposit amount: {error}.")
+                return
+            self.credit(paise)
+            print(f"{format_paise(paise)} deposited successfully!")
+
+    def credit(self, paise):
+        """Add paise to the balance and record it."""
+        check_paise(paise)
+        self.balance += paise
+        self.save_data("deposit", paise, balance=self.balance)
+
+    def debit(self, paise):
+        """Take paise from the balance if funds allow; returns whether it did."""
+        check_paise(paise)
+        if paise > self.balance:
+            return False
+        self.balance -= paise
+        self.save_data("withdraw", -paise, balance=self.balance)
+        return True
 
     def withdraw(self):
         if self.verify_pin():
             try:
-                amount = float(input("Enter amount to withdraw: "))
-                if 0 < amount <= self.balance:
-                    self.balance -= amount
-                    print(f"₹{amount} withdrawn successfully!")
-                    self.transactions.append(f"Withdrew: ₹{amount}")
-                    self.save_data()
-                else:
-                    print("Invalid amount or insufficient funds.")
-            except ValueError:
-                print("Invalid input. Enter a number.")
+                paise = parse_amount(input("Enter amount to withdraw: "))
+            except ValueError as error:
+                print(f"Invalid withdrawal amount: {error}.")
+                return
+            if self.debit(paise):
+                print(f"{format_paise(paise)} withdrawn successfully!")
+            else:
+                print("Insufficient funds.")
 
     def change_pin(self):
         if self.verify_pin():
@@ -101,8 +125,7 @@ class ATM:
                 if new_pin == confirm_pin:
                     self.pin = bcrypt.hashpw(new_pin.encode(), bcrypt.gensalt()).decode()
                     print("PIN changed successfully!")
-                    self.transactions.append("Changed PIN")
-                    self.save_data()
+                    self.save_data("pin", pin=self.pin)
                     break
                 else:
                     print("PIN confirmation failed. Try again.")
@@ -110,11 +133,37 @@ class ATM:
     def show_transactions(self):
         if self.verify_pin():
             print("Transaction History:")
-            if not self.transactions:
-                print("No transactions yet.")
-            else:
-                for transaction in self.transactions:
+            summary = self.summary()
+            if summary:
+                print(summary)
+            number = 0
+            while True:
+                page = self.history_page(number)
+                if not page:
+                    if number == 0:
+                        print("No transactions yet.")
+                    break
+                for transaction in page:
                     print(f" - {transaction}")
+                if len(page) < PAGE_SIZE or input("Enter for older transactions, q to return: ").lower() == "q":
+                    break
+                number += 1
+
+    def history_page(self, number):
+        """Page `number` (0 = most recent) of transactions as text, newest first."""
+        return [tx.text() for tx in self.journal.transactions.page(number, PAGE_SIZE)]
+
+    def summary(self):
+        # Totals come from the history's checkpoints, not a scan of every record
+        statement = self.journal.transactions.statement()
+        if not statement["transactions"]:
+            return None
+        return (f"Deposits {format_paise(statement['credits'])}, withdrawals {format_paise(statement['debits'])} "
+                f"over {statement['transactions']} transactions (newest first)")
+
+    def close(self):
+        self.sessions.close(self.token)
+        self.journal.close()
 
     def main_menu(self):
         while True:
@@ -139,11 +188,80 @@ class ATM:
                 self.show_transactions()
             elif choice == "6":
                 print("Thank you for using our ATM!")
+                self.close()
                 break
             else:
                 print("Invalid choice. Enter a number between 1 and 6.")
 
+class LedgerATM(ATM):
+    """ATM session for one card of a multi-account Ledger (see ledger.py).
+
+    Many sessions can share one Ledger from different threads; balances are
+    never cached here, every operation goes to the ledger atomically.
+    """
+
+    def __init__(self, ledger, card, sessions=None):
+        self.ledger = ledger
+        self.card = card
+        self.subject = card
+        self.sessions = sessions or SessionManager()
+        self.token = None
+        self.cursors = {0: None}  # history page -> id to page before (keyset paging)
+        self.load_data()
+
+        # A new card: set its PIN, which opens the account
+        if self.pin is None:
+            self.set_initial_pin()
+
+    def load_data(self):
+        account = self.ledger.account(self.card)
+        self.account_id, self.pin = account if account else (None, None)
+
+    def save_data(self, kind=None, amount=0, pin=None, **changes):
+        # Money moves through credit/debit; only PIN changes arrive here
+        if pin is None:
+            return
+        if self.account_id is None:
+            self.account_id = self.ledger.open_account(self.card, pin)
+        else:
+            self.ledger.set_pin(self.account_id, pin)
+
+    def check_balance(self):
+        if self.verify_pin():
+            print(f"Your current balance is: {format_paise(self.ledger.check_balance(self.account_id))}")
+
+    # Amounts arrive already checked by parse_amount; the ledger checks them again
+    def credit(self, paise):
+        self.ledger.deposit(self.account_id, paise)
+
+    def debit(self, paise):
+        try:
+            self.ledger.withdraw(self.account_id, paise)
+        except InsufficientFunds:
+            return False
+        return True
+
+    def history_page(self, number):
+        if number not in self.cursors:
+            return []
+        rows = self.ledger.history(self.account_id, PAGE_SIZE, self.cursors[number])
+        if rows:
+            self.cursors[number + 1] = rows[-1][0]
+        return [Transaction(*row).text() for row in rows]
+
+    def summary(self):
+        return None
+
+    def close(self):
+        self.sessions.close(self.token)
+        self.ledger.close()
+
+
 # Run the ATM Simulation
 if __name__ == "__main__":
-    atm = ATM()
+    parser = argparse.ArgumentParser(description="ATM simulation")
+    parser.add_argument("--card", help="use the multi-account ledger (atm_ledger.db) with this card number")
+    args = parser.parse_args()
+
+    atm = LedgerATM(Ledger("atm_ledger.db"), args.card) if args.card else ATM()
     atm.main_menu()
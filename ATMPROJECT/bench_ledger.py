@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import threading
+import time
+
+import bcrypt
+
+from ledger import DEFAULT_BALANCE, InsufficientFunds, Ledger
+
+# Transactions/sec of the SQLite ledger with N concurrent ATM sessions, each
+# doing random deposits and withdrawals against a shared pool of accounts.
+# After every run the total money in the ledger is checked against the sum
+# of the successful operations, so lost or double-applied updates show up.
+
+
+def setup(path, n_accounts):
+    ledger = Ledger(path)
+    # One bcrypt hash for all cards: hashing is not what is measured here
+    pin_hash = bcrypt.hashpw(b"0000", bcrypt.gensalt(4)).decode()
+    for i in range(n_accounts):
+        ledger.open_account(f"card{i}", pin_hash)
+    ledger.close()
+
+
+def session(ledger, n_accounts, n_ops, seed):
+    """One ATM session; returns (completed operations, net paise moved into the ledger)."""
+    rng = random.Random(seed)
+    done = net = 0
+    for _ in range(n_ops):
+        account_id = rng.randrange(n_accounts) + 1
+        paise = rng.randrange(100, 50_000)
+        try:
+            if rng.random() < 0.5:
+                ledger.deposit(account_id, paise)
+                net += paise
+            else:
+                ledger.withdraw(account_id, paise)
+                net -= paise
+        except InsufficientFunds:
+            pass
+        done += 1
+    ledger.close()
+    return done, net
+
+
+def run_threads(ledger, sessions, n_accounts, n_ops):
+    results = [None] * sessions
+
+    def worker(i):
+        results[i] = session(ledger, n_accounts, n_ops, i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def run_asyncio(ledger, sessions, n_accounts, n_ops):
+    async def main():
+        return await asyncio.gather(*(asyncio.to_thread(session, ledger, n_accounts, n_ops, i)
+                                      for i in range(sessions)))
+    return asyncio.run(main())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ledger transactions/sec with concurrent ATM sessions")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--ops", type=int, default=20_000, help="operations per run, split across sessions")
+    parser.add_argument("--mode", choices=["threads", "asyncio"], default="threads")
+    args = parser.parse_args()
+
+    run = run_threads if args.mode == "threads" else run_asyncio
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_ledger.db")
+        setup(path, args.accounts)
+        ledger = Ledger(path)
+        expected = args.accounts * DEFAULT_BALANCE
+        assert ledger.total_balance() == expected
+        for sessions in args.sessions:
+            per_session = max(1, args.ops // sessions)
+            start = time.perf_counter()
+            results = run(ledger, sessions, args.accounts, per_session)
+            elapsed = time.perf_counter() - start
+            done = sum(r[0] for r in results)
+            expected += sum(r[1] for r in results)
+            consistent = ledger.total_balance() == expected
+            print(f"{sessions:>3} sessions ({args.mode}): {done / elapsed:>8,.0f} tx/sec "
+                  f"({done} ops in {elapsed:.2f}s), balances {'consistent' if consistent else 'INCONSISTENT'}")
+        ledger.close()
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import bcrypt
+
+from ledger import Ledger
+from session import SessionManager
+
+# Operations/sec of authenticated balance enquiries against the ledger:
+#   per-op bcrypt   verify the PIN with bcrypt before every operation
+#   session token   bcrypt once, then an HMAC token check per operation
+# plus concurrent logins through an asyncio front end, where bcrypt runs on
+# the session thread pool; the event loop's worst stall shows whether
+# hashing blocked it.
+
+
+def bench_ops(ledger, account_id, pin_hash, sessions, n, per_op_bcrypt):
+    token = None if per_op_bcrypt else sessions.open("card0", "0000", pin_hash)
+    start = time.perf_counter()
+    for _ in range(n):
+        if per_op_bcrypt:
+            assert sessions.check_pin("0000", pin_hash)
+        else:
+            assert sessions.check(token, "card0")
+        ledger.balance(account_id)
+    elapsed = time.perf_counter() - start
+    label = "per-op bcrypt" if per_op_bcrypt else "session token"
+    print(f"{label:<14}: {n / elapsed:>12,.1f} ops/sec ({elapsed / n * 1e3:.3f} ms/op)")
+
+
+async def bench_logins(pin_hash, sessions, n):
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        # Should wake every 10ms; a longer gap means the loop was blocked
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls.append(time.perf_counter() - start - 0.01)
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    tokens = await asyncio.gather(*(sessions.open_async(f"card{i}", "0000", pin_hash) for i in range(n)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    assert all(tokens)
+    print(f"async logins  : {n / elapsed:>12,.1f} logins/sec with {sessions.executor._max_workers} hashing threads, "
+          f"worst event-loop stall {max(stalls, default=0) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ATM operations/sec with and without session tokens")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost (gensalt rounds)")
+    parser.add_argument("--bcrypt-ops", type=int, default=20)
+    parser.add_argument("--session-ops", type=int, default=100_000)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None, help="hashing threads (default: executor's)")
+    args = parser.parse_args()
+
+    pin_hash = bcrypt.hashpw(b"0000", bcrypt.gensalt(args.rounds)).decode()
+    sessions = SessionManager(max_workers=args.workers)
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = Ledger(os.path.join(tmp, "bench_session.db"))
+        account_id = ledger.open_account("card0", pin_hash)
+        bench_ops(ledger, account_id, pin_hash, sessions, args.bcrypt_ops, per_op_bcrypt=True)
+        bench_ops(ledger, account_id, pin_hash, sessions, args.session_ops, per_op_bcrypt=False)
+        ledger.close()
+    asyncio.run(bench_logins(pin_hash, sessions, args.logins))
+    sessions.shutdown()
@@ -0,0 +1,258 @@
+import bisect
+import os
+import re
+import struct
+
+from ledger import format_paise, parse_amount
+
+# Transaction history as fixed-width binary records, one after another:
+#
+#   <path>        RECORD per transaction: seq, timestamp, amount and balance
+#                 after it (integer paise), kind
+#   <path>.idx    CHECKPOINT every checkpoint_every records: cumulative
+#                 credits and debits up to the end of that block
+#
+# Record i lives at offset i * RECORD.size, so a page is one seek and one
+# read, and date ranges are found by binary search on the timestamps (which
+# never decrease). Statement totals over any range come from two checkpoints
+# plus at most two partial blocks, however long the history is. The .idx file
+# is derived data and is rebuilt if it is missing or behind.
+
+RECORD = struct.Struct("<qdqqB7x")  # 40 bytes
+CHECKPOINT = struct.Struct("<qq")
+
+KINDS = {"deposit": 1, "withdraw": 2, "balance": 3, "pin": 4}
+NAMES = {code: name for name, code in KINDS.items()}
+LABELS = {"deposit": "Deposited", "withdraw": "Withdrew", "balance": "Checked balance", "pin": "Changed PIN"}
+
+
+class Transaction:
+    __slots__ = ("seq", "ts", "kind", "amount", "balance")
+
+    def __init__(self, seq, ts, kind, amount, balance):
+        self.seq = seq
+        self.ts = ts
+        self.kind = kind  # one of KINDS
+        self.amount = amount  # paise; negative for withdrawals
+        self.balance = balance  # paise, after this transaction
+
+    def pack(self):
+        return RECORD.pack(self.seq, self.ts, self.amount, self.balance, KINDS[self.kind])
+
+    @classmethod
+    def unpack(cls, buffer, offset=0):
+        seq, ts, amount, balance, kind = RECORD.unpack_from(buffer, offset)
+        return cls(seq, ts, NAMES[kind], amount, balance)
+
+    def text(self):
+        label = LABELS[self.kind]
+        if self.kind in ("deposit", "withdraw"):
+            label += f": {format_paise(abs(self.amount))}"
+        return f"{label} (balance {format_paise(self.balance)})"
+
+    def __repr__(self):
+        return (f"Transaction(seq={self.seq}, ts={self.ts}, kind={self.kind!r}, amount={self.amount}, "
+                f"balance={self.balance})")
+
+
+class _Timestamps:
+    """Sequence view of the timestamps, for bisect."""
+
+    def __init__(self, history):
+        self.history = history
+
+    def __len__(self):
+        return len(self.history)
+
+    def __getitem__(self, i):
+        return self.history[i].ts
+
+
+class History:
+    """Archived records on disk plus not yet archived ones (the journal tail) in memory."""
+
+    def __init__(self, path, checkpoint_every=1024):
+        self.path = path
+        self.checkpoint_path = path + ".idx"
+        self.checkpoint_every = checkpoint_every
+        self.file = open(path, "a+b")
+        size = os.path.getsize(path)
+        if size % RECORD.size:
+            self.file.truncate(size - size % RECORD.size)  # torn write at the tail
+        self.count = size // RECORD.size
+        self.tail = []
+        self._load_checkpoints()
+
+    # ---- checkpoints ----
+
+    def _load_checkpoints(self):
+        try:
+            with open(self.checkpoint_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+        blocks = min(len(data) // CHECKPOINT.size, self.count // self.checkpoint_every)
+        self.checkpoints = [CHECKPOINT.unpack_from(data, i * CHECKPOINT.size) for i in range(blocks)]
+        # Rebuild blocks the index is missing, then sum the open (partial) block
+        credits, debits = self.checkpoints[-1] if self.checkpoints else (0, 0)
+        start = blocks * self.checkpoint_every
+        for i, tx in enumerate(self._read(start, self.count), start):
+            if tx.amount > 0:
+                credits += tx.amount
+            else:
+                debits -= tx.amount
+            if (i + 1) % self.checkpoint_every == 0:
+                self.checkpoints.append((credits, debits))
+        self.running = (credits, debits)
+        with open(self.checkpoint_path, "wb") as file:
+            file.write(b"".join(CHECKPOINT.pack(*checkpoint) for checkpoint in self.checkpoints))
+        self.index = open(self.checkpoint_path, "ab")
+
+    def _prefix_totals(self, stop):
+        """(credits, debits) over records [0, stop)."""
+        block = min(stop, self.count) // self.checkpoint_every
+        credits, debits = self.checkpoints[block - 1] if block else (0, 0)
+        for tx in self.slice(block * self.checkpoint_every, stop):
+            if tx.amount > 0:
+                credits += tx.amount
+            else:
+                debits -= tx.amount
+        return credits, debits
+
+    # ---- reading ----
+
+    def __len__(self):
+        return self.count + len(self.tail)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        if i >= self.count:
+            return self.tail[i - self.count]
+        return self._read(i, i + 1)[0]
+
+    def _read(self, start, stop):
+        if stop <= start:
+            return []
+        self.file.flush()
+        self.file.seek(start * RECORD.size)
+        buffer = self.file.read((stop - start) * RECORD.size)
+        return [Transaction.unpack(buffer, offset) for offset in range(0, len(buffer), RECORD.size)]
+
+    def slice(self, start, stop):
+        """Transactions [start, stop), oldest first."""
+        start, stop = max(0, start), min(stop, len(self))
+        return self._read(start, min(stop, self.count)) + self.tail[max(0, start - self.count):
+                                                                    max(0, stop - self.count)]
+
+    def page(self, number, per_page=10):
+        """Page `number` (0 = most recent) of per_page transactions, newest first."""
+        stop = len(self) - number * per_page
+        return self.slice(stop - per_page, stop)[::-1] if stop > 0 else []
+
+    def index_at(self, ts):
+        """Index of the first transaction at or after timestamp ts."""
+        return bisect.bisect_left(_Timestamps(self), ts)
+
+    def between(self, start_ts=None, end_ts=None, block=4096):
+        """Transactions with start_ts <= ts < end_ts, oldest first, read a block at a time."""
+        start = 0 if start_ts is None else self.index_at(start_ts)
+        stop = len(self) if end_ts is None else self.index_at(end_ts)
+        for offset in range(start, stop, block):
+            yield from self.slice(offset, min(offset + block, stop))
+
+    def statement(self, start_ts=None, end_ts=None):
+        """Opening/closing balance and credit/debit totals for start_ts <= ts < end_ts."""
+        start = 0 if start_ts is None else self.index_at(start_ts)
+        stop = len(self) if end_ts is None else self.index_at(end_ts)
+        if start < len(self):
+            first = self[start]
+            opening = first.balance - first.amount
+        else:
+            opening = self[-1].balance if len(self) else 0
+        stop = max(stop, start)  # an end before the start is an empty range
+        closing = self[stop - 1].balance if stop > start else opening
+        credits_start, debits_start = self._prefix_totals(start)
+        credits_stop, debits_stop = self._prefix_totals(stop)
+        return {"transactions": stop - start, "opening": opening, "closing": closing,
+                "credits": credits_stop - credits_start, "debits": debits_stop - debits_start}
+
+    # ---- writing ----
+
+    def last_ts(self):
+        return self[-1].ts if len(self) else float("-inf")
+
+    def add_pending(self, tx):
+        """Keep a journaled transaction in memory until archive()."""
+        tx.ts = max(tx.ts, self.last_ts())  # timestamps must not decrease for bisect
+        self.tail.append(tx)
+
+    def archived_seq(self):
+        return self._read(self.count - 1, self.count)[0].seq if self.count else 0
+
+    def archive(self):
+        """Append the pending transactions to disk (skipping any already archived) and fsync."""
+        archived = self.archived_seq()
+        credits, debits = self.running
+        for tx in self.tail:
+            if tx.seq <= archived:
+                continue
+            self.file.write(tx.pack())
+            self.count += 1
+            if tx.amount > 0:
+                credits += tx.amount
+            else:
+                debits -= tx.amount
+            if self.count % self.checkpoint_every == 0:
+                self.checkpoints.append((credits, debits))
+                self.index.write(CHECKPOINT.pack(credits, debits))
+        self.running = (credits, debits)
+        self.tail = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.index.flush()
+
+    def close(self):
+        self.file.close()
+        self.index.close()
+
+
+#============================= LEGACY TEXT HISTORY ======================
+
+# The old ATM wrote f"Deposited: ₹{amount}" with a float, so "₹1e-05" happens
+_AMOUNT = re.compile(r"^(Deposited|Withdrew): ₹(\S+)$")
+_PLAIN = {"Checked balance": "balance", "Changed PIN": "pin"}
+
+
+def parse_legacy(texts, closing):
+    """Transactions from the old free-text history, ending at the stored balance (closing paise).
+
+    Balances are replayed backwards from closing, so the history always agrees
+    with the migrated account balance. Amounts are rounded half up to paise;
+    an entry in neither known form raises ValueError. The old format kept no
+    times, so every entry gets timestamp 0.
+    """
+    entries = []
+    for text in texts:
+        match = _AMOUNT.match(text)
+        if match:
+            try:
+                amount = parse_amount(match.group(2), exact=False)
+            except ValueError as error:
+                raise ValueError(f"bad legacy transaction {text!r}: {error}") from None
+            kind = "deposit" if match.group(1) == "Deposited" else "withdraw"
+            entries.append((kind, amount if kind == "deposit" else -amount))
+        elif text in _PLAIN:
+            entries.append((_PLAIN[text], 0))
+        else:
+            raise ValueError(f"unrecognised legacy transaction {text!r}")
+
+    balances = []
+    balance = closing
+    for _, amount in reversed(entries):
+        balances.append(balance)
+        balance -= amount
+    return [Transaction(seq, 0.0, kind, amount, balance)
+            for seq, ((kind, amount), balance) in enumerate(zip(entries, reversed(balances)), 1)]
@@ -0,0 +1,164 @@
+import json
+import os
+import time
+
+from history import History, Transaction
+
+# Append-only storage for the ATM state. Files sharing a prefix:
+#
+#   <prefix>.snapshot.json   state (balance, PIN hash) as of record `seq`
+#   <prefix>.journal         JSON lines appended since that snapshot, each
+#                            {"seq", "tx", <changed state fields>} where tx is
+#                            [timestamp, kind, amount, balance] or null
+#   <prefix>.history(.idx)   binary transaction records moved out of the
+#                            journal by compaction (see history.py)
+#
+# Every operation appends one short line, so its cost does not depend on how
+# long the history is. Writes reach the OS immediately; fsync is batched
+# (every sync_every records or sync_interval seconds, and on close), which
+# bounds what an OS crash can lose. After snapshot_every records the journal
+# is compacted: its transactions move to the history file, a new snapshot is
+# written atomically and the journal is truncated. Startup loads the snapshot
+# and replays only the journal.
+
+
+def _fsync_dir(path):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+
+class Journal:
+    """Snapshot + append-only journal for a small state dict and its transaction history.
+
+    transactions (a History) covers both archived and journaled transactions.
+    """
+
+    def __init__(self, prefix, defaults, sync_every=8, sync_interval=0.5, snapshot_every=1000):
+        self.snapshot_path = prefix + ".snapshot.json"
+        self.journal_path = prefix + ".journal"
+        self.transactions = History(prefix + ".history")
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+
+        self.state = dict(defaults)
+        self.seq = 0
+        self._load_snapshot()
+        self.pending = self._replay()
+        self.file = open(self.journal_path, "a", encoding="utf-8")
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    # ---- startup ----
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            return
+        self.seq = snapshot.pop("seq")
+        self.state.update(snapshot)
+
+    def _replay(self):
+        """Apply journal records newer than the snapshot; returns how many the journal holds."""
+        count = 0
+        good_end = 0
+        archived = self.transactions.archived_seq()
+        try:
+            with open(self.journal_path, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break  # torn write at the tail
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    good_end += len(line)
+                    count += 1
+                    if record["seq"] > self.seq:
+                        self.seq = record["seq"]
+                        self.state.update({k: v for k, v in record.items() if k not in ("seq", "tx")})
+                    if record.get("tx") is not None and record["seq"] > archived:
+                        self.transactions.add_pending(Transaction(record["seq"], *record["tx"]))
+        except FileNotFoundError:
+            return 0
+        if good_end < os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as file:
+                file.truncate(good_end)
+        return count
+
+    # ---- writing ----
+
+    def append(self, kind=None, amount=0, **changes):
+        """Record an operation: an optional transaction of kind and the state fields it changed.
+
+        The transaction's balance is the state's "balance" after the change.
+        """
+        self.seq += 1
+        self.state.update(changes)
+        record = {"seq": self.seq, "tx": None}
+        if kind is not None:
+            tx = Transaction(self.seq, time.time(), kind, amount, self.state["balance"])
+            self.transactions.add_pending(tx)
+            record["tx"] = [tx.ts, tx.kind, tx.amount, tx.balance]
+        record.update(changes)
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.unsynced += 1
+        self.pending += 1
+        if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+        if self.pending >= self.snapshot_every:
+            self.compact()
+
+    def sync(self):
+        if self.unsynced:
+            os.fsync(self.file.fileno())
+            self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def compact(self):
+        """Move journaled transactions to the history file, snapshot the state and truncate the journal.
+
+        Each step is safe to interrupt: transactions already archived (by
+        seq) are not archived twice, and journal records at or below the
+        snapshot's seq are skipped on replay.
+        """
+        self.sync()
+        self.transactions.archive()
+        self.write_snapshot()
+        self.file.close()
+        self.file = open(self.journal_path, "w", encoding="utf-8")
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def write_snapshot(self):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(dict(self.state, seq=self.seq), file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(self.snapshot_path)
+
+    def close(self):
+        self.sync()
+        self.file.close()
+        self.transactions.close()
+
+    # ---- migration ----
+
+    def import_state(self, state, transactions):
+        """Start from existing state and history (e.g. a legacy store); needs an empty journal."""
+        self.state.update(state)
+        for tx in transactions:
+            self.transactions.add_pending(tx)
+            self.seq = tx.seq
+        self.transactions.archive()
+        self.write_snapshot()
@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+import time
+from decimal import Decimal, ROUND_HALF_UP
+
+# Multi-account ledger in SQLite (WAL mode). Balances and amounts are integer
+# paise, so no rounding creeps in. Every operation is one short transaction:
+#   - a withdrawal is a conditional UPDATE (balance >= amount), so two
+#     sessions can never overdraw the same account between check and write
+#   - the balance change and its history row commit together or not at all
+# SQLite serializes writers on the database, which is what makes the
+# conditional UPDATE safe; readers (balance, history) never block on WAL.
+# Each thread gets its own connection, so sessions can run in threads or via
+# asyncio.to_thread.
+
+DEFAULT_BALANCE = 100_000  # ₹1000 in paise
+MAX_PAISE = 10**12  # largest single deposit/withdrawal; keeps balances far inside 64-bit integers
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+def to_paise(amount):
+    """Rupee amount (number or string) as integer paise, rounded half up."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def format_paise(paise):
+    return f"₹{paise // 100}.{paise % 100:02d}"
+
+
+def check_paise(paise):
+    """Return paise if it is a valid deposit/withdrawal amount; raises ValueError otherwise."""
+    if paise <= 0:
+        raise ValueError("amount must be positive")
+    if paise > MAX_PAISE:
+        raise ValueError(f"amount must be at most {format_paise(MAX_PAISE)}")
+    return paise
+
+
+def parse_amount(text, exact=True):
+    """Rupee amount typed at the prompt as integer paise.
+
+    Anything but a finite, positive, whole number of paise raises ValueError,
+    checked on the exact decimal value rather than a float. With exact=False
+    (amounts written by the old float-based ATM) extra decimals are rounded
+    half up instead, so a positive amount under half a paisa becomes 0.
+    """
+    try:
+        paise = Decimal(text.strip()) * 100
+    except ArithmeticError:  # decimal.InvalidOperation for non-numbers, Overflow for huge exponents
+        raise ValueError("enter a number") from None
+    if not paise.is_finite():
+        raise ValueError("enter a number")
+    if paise <= 0:
+        raise ValueError("amount must be positive")
+    if paise > MAX_PAISE:
+        raise ValueError(f"amount must be at most {format_paise(MAX_PAISE)}")
+    rounded = paise.quantize(Decimal(1), rounding=ROUND_HALF_UP)
+    if exact and rounded != paise:
+        raise ValueError("use at most two decimal places")
+    return int(rounded)
+
+
+class Ledger:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS accounts (
+            id INTEGER PRIMARY KEY,
+            card TEXT UNIQUE NOT NULL,
+            pin TEXT NOT NULL,
+            balance INTEGER NOT NULL CHECK (balance >= 0)
+        );
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY,
+            account_id INTEGER NOT NULL REFERENCES accounts (id),
+            ts REAL NOT NULL,
+            kind TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            balance INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS transactions_account ON transactions (account_id, id);
+    """
+
+    def __init__(self, path="atm_ledger.db", timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self.local = threading.local()
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly below
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    def _write(self, fn):
+        # BEGIN IMMEDIATE takes the write lock up front, so the transaction
+        # cannot fail half way with SQLITE_BUSY after reading
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    # ---- accounts ----
+
+    # PINs are stored as the bcrypt hashes the ATM computes; the ledger never
+    # sees a plain PIN
+
+    def open_account(self, card, pin_hash, balance=DEFAULT_BALANCE):
+        """Create an account; raises sqlite3.IntegrityError if the card exists. Returns its id."""
+        return self._write(lambda conn: conn.execute(
+            "INSERT INTO accounts (card, pin, balance) VALUES (?, ?, ?)", (card, pin_hash, balance)).lastrowid)
+
+    def account(self, card):
+        """(account id, PIN hash) for a card, or None."""
+        return self._conn().execute("SELECT id, pin FROM accounts WHERE card = ?", (card,)).fetchone()
+
+    def set_pin(self, account_id, pin_hash):
+        def change(conn):
+            conn.execute("UPDATE accounts SET pin = ? WHERE id = ?", (pin_hash, account_id))
+            self._log(conn, account_id, "pin", 0)
+        self._write(change)
+
+    def balance(self, account_id):
+        return self._conn().execute("SELECT balance FROM accounts WHERE id = ?", (account_id,)).fetchone()[0]
+
+    def total_balance(self):
+        """Sum of all account balances (for reconciliation)."""
+        return self._conn().execute("SELECT COALESCE(SUM(balance), 0) FROM accounts").fetchone()[0]
+
+    def check_balance(self, account_id):
+        """Current balance, logged as a balance enquiry."""
+        return self._write(lambda conn: self._log(conn, account_id, "balance", 0))
+
+    # ---- money ----
+
+    def _log(self, conn, account_id, kind, amount):
+        balance = conn.execute("SELECT balance FROM accounts WHERE id = ?", (account_id,)).fetchone()[0]
+        conn.execute("INSERT INTO transactions (account_id, ts, kind, amount, balance) VALUES (?, ?, ?, ?, ?)",
+                     (account_id, time.time(), kind, amount, balance))
+        return balance
+
+    def deposit(self, account_id, paise):
+        """Credit paise; returns the new balance."""
+        check_paise(paise)
+
+        def credit(conn):
+            conn.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (paise, account_id))
+            return self._log(conn, account_id, "deposit", paise)
+        return self._write(credit)
+
+    def withdraw(self, account_id, paise):
+        """Debit paise; returns the new balance or raises InsufficientFunds."""
+        check_paise(paise)
+
+        def debit(conn):
+            updated = conn.execute("UPDATE accounts SET balance = balance - ? WHERE id = ? AND balance >= ?",
+                                   (paise, account_id, paise)).rowcount
+            if not updated:
+                raise InsufficientFunds(f"balance below {format_paise(paise)}")
+            return self._log(conn, account_id, "withdraw", -paise)
+        return self._write(debit)
+
+    # ---- history ----
+
+    def history(self, account_id, limit=20, before_id=None):
+        """Newest-first (id, ts, kind, amount, balance) rows, paged by id via the account index.
+
+        Pass the last id of one page as before_id to get the next.
+        """
+        if before_id is None:
+            query = ("SELECT id, ts, kind, amount, balance FROM transactions "
+                     "WHERE account_id = ? ORDER BY id DESC LIMIT ?")
+            params = (account_id, limit)
+        else:
+            query = ("SELECT id, ts, kind, amount, balance FROM transactions "
+                     "WHERE account_id = ? AND id < ? ORDER BY id DESC LIMIT ?")
+            params = (account_id, before_id, limit)
+        return self._conn().execute(query, params).fetchall()
@@ -0,0 +1,101 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+# bcrypt is slow on purpose, so paying for it on every menu action makes each
+# one cost hundreds of milliseconds. A session verifies the PIN with bcrypt
+# once and hands out a token; later operations check the token (one HMAC and
+# a dict lookup) until the session is closed or sits idle for idle_timeout
+# seconds. Tokens are "<session id>.<HMAC of subject and id>" under a key
+# that only lives in this process, so they die with it.
+#
+# checkpw runs on a thread pool: bcrypt releases the GIL while hashing, so
+# verify_async/open_async keep an asyncio front end responsive and several
+# logins can hash in parallel.
+
+IDLE_TIMEOUT = 120  # seconds
+
+
+class SessionManager:
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, max_workers=None, key=None):
+        self.idle_timeout = idle_timeout
+        self.key = key or os.urandom(32)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self.lock = threading.Lock()
+        self.sessions = {}  # session id -> [subject, last used (monotonic)]
+
+    # ---- PIN verification ----
+
+    @staticmethod
+    def check_pin(pin, pin_hash):
+        return bcrypt.checkpw(pin.encode(), pin_hash.encode())
+
+    async def verify_async(self, pin, pin_hash):
+        """check_pin on the hashing pool, without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.check_pin, pin, pin_hash)
+
+    # ---- tokens ----
+
+    def _sign(self, subject, session_id):
+        return hmac.new(self.key, f"{subject}\0{session_id}".encode(), hashlib.sha256).hexdigest()
+
+    def issue(self, subject):
+        """Token for a new session of subject (the caller has already checked the PIN)."""
+        session_id = os.urandom(16).hex()
+        with self.lock:
+            self.sessions[session_id] = [subject, time.monotonic()]
+        return f"{session_id}.{self._sign(subject, session_id)}"
+
+    def open(self, subject, pin, pin_hash):
+        """Check pin with bcrypt and return a session token, or None if it is wrong."""
+        return self.issue(subject) if self.check_pin(pin, pin_hash) else None
+
+    async def open_async(self, subject, pin, pin_hash):
+        return self.issue(subject) if await self.verify_async(pin, pin_hash) else None
+
+    def check(self, token, subject=None):
+        """Subject of a live session (refreshing its idle timer), or None.
+
+        With subject given, the token must also belong to that subject.
+        """
+        if not token or "." not in token:
+            return None
+        session_id, signature = token.split(".", 1)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                return None
+            if now - entry[1] > self.idle_timeout:
+                del self.sessions[session_id]
+                return None
+            if not hmac.compare_digest(signature, self._sign(entry[0], session_id)):
+                return None
+            if subject is not None and entry[0] != subject:
+                return None
+            entry[1] = now
+            return entry[0]
+
+    def close(self, token):
+        """End a session; unknown tokens are ignored."""
+        with self.lock:
+            self.sessions.pop((token or "").split(".", 1)[0], None)
+
+    def expire(self):
+        """Drop idle sessions; returns how many were removed."""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self.lock:
+            stale = [session_id for session_id, (_, used) in self.sessions.items() if used < cutoff]
+            for session_id in stale:
+                del self.sessions[session_id]
+        return len(stale)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
@@ -1,58 +1,73 @@
+from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-import pandas as pd
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+import argparse
 import os
+import time
+from streaming_stats import STATS, summarize
 
-def read_data(file_path):
-    """Reads data from a CSV file and returns a DataFrame."""
-    if not os.path.exists(file_path):  # Check if the file exists
-        raise FileNotFoundError(f"The file {file_path} was not found.")
-    return pd.read_csv(file_path)  # Read and return the CSV data as a DataFrame
-
-def analyze_data(df):
-    """Performs basic analysis on the DataFrame."""
-    summary = df.describe()  # Generate summary statistics of the dataset
-    return summary
-
-def generate_pdf_report(summary, output_file):
-    """Generates a PDF report using ReportLab."""
-    c = canvas.Canvas(output_file, pagesize=letter)  # Create a new PDF canvas
-    width, height = letter  # Get page dimensions
-    
-    # Set font and title of the report
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(200, height - 50, "Automated Data Analysis Report")
-    c.setFont("Helvetica", 12)
-    y_position = height - 80  # Initial Y position for text
-    
-    for col in summary.columns:
-        c.drawString(50, y_position, f"Summary statistics for {col}")  # Column title
-        y_position -= 20
-        c.setFont("Helvetica", 10)
-        stats = summary[col].to_string().split("\n")  # Convert statistics to list
-        for stat in stats:
-            c.drawString(60, y_position, stat)  # Print each stat in the report
-            y_position -= 15
-        y_position -= 10
-        c.setFont("Helvetica", 12)
-        
-        # Start a new page if the Y position is too low
-        if y_position < 50:
-            c.showPage()
-            c.setFont("Helvetica", 12)
-            y_position = height - 50
-    
-    c.save()  # Save the PDF file
+def analyze_data(file_path, chunksize=100_000):
+    """Computes describe()-style statistics in one chunked pass over the CSV (bounded memory)."""
+    return summarize(file_path, chunksize=chunksize)  # (summary DataFrame, row count)
+
+def _format(value):
+    """Formats one statistic for the table."""
+    if value != value:  # NaN
+        return "-"
+    return f"{value:,.4g}" if abs(value) < 1e6 else f"{value:,.0f}"
+
+def generate_pdf_report(summary, output_file, source=None, rows=None, rows_per_page=40):
+    """Generates a PDF report using ReportLab's platypus layout.
+
+    Statistics go into one Table (a row per data column, a column per
+    statistic) that is drawn in batches and split across pages, with the
+    header repeated, instead of one drawString call per line.
+    """
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(output_file, pagesize=letter, title="Automated Data Analysis Report",
+                            leftMargin=40, rightMargin=40, topMargin=50, bottomMargin=50)
+
+    # Title and a short description of the input
+    story = [Paragraph("Automated Data Analysis Report", styles["Title"])]
+    if source is not None:
+        size_mb = os.path.getsize(source) / 2**20
+        story.append(Paragraph(f"Source: {os.path.basename(source)} ({size_mb:,.1f} MB, {rows:,} rows, "
+                               f"{len(summary.columns)} numeric columns)", styles["Normal"]))
+    story.append(Paragraph("Quartiles are approximate (t-digest) for large files.", styles["Italic"]))
+    story.append(Spacer(1, 12))
+
+    header = ["Column"] + STATS
+    body = [[str(col)] + [_format(summary.at[stat, col]) for stat in STATS] for col in summary.columns]
+    style = TableStyle([
+        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 9),
+        ("FONT", (0, 1), (-1, -1), "Helvetica", 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+    ])
+    # One Table per batch of rows keeps each layout pass small for wide files
+    for start in range(0, max(len(body), 1), rows_per_page):
+        table = Table([header] + body[start:start + rows_per_page], repeatRows=1)
+        table.setStyle(style)
+        story.append(table)
+        story.append(Spacer(1, 12))
+
+    doc.build(story)  # Lays out and writes the PDF page by page
 
 def main():
-    input_file = "sample_data.csv"  # Change this to your actual file
-    output_file = "report_lab.pdf"
-    
+    parser = argparse.ArgumentParser(description="Summary statistics report for a CSV file")
+    parser.add_argument("input", nargs="?", default="sample_data.csv")  # Change this to your actual file
+    parser.add_argument("output", nargs="?", default="report_lab.pdf")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows read per chunk")
+    args = parser.parse_args()
+
     try:
-        df = read_data(input_file)  # Read the data
-        summary = analyze_data(df)  # Analyze the data
-        generate_pdf_report(summary, output_file)  # Generate the PDF report
-        print(f"Report generated successfully: {output_file}")
+        start = time.perf_counter()
+        summary, rows = analyze_data(args.input, args.chunksize)  # Analyze the data in one pass
+        generate_pdf_report(summary, args.output, args.input, rows)  # Generate the PDF report
+        print(f"Report generated successfully: {args.output} ({rows:,} rows in {time.perf_counter() - start:.2f}s)")
     except FileNotFoundError as e:
         print(e)  # Print an error message if the file is not found
 
@@ -0,0 +1,135 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# One-pass, bounded-memory replacement for df.describe() on CSVs of any size.
+# The file is read in chunks; per column we keep
+#   - count, mean and M2 (sum of squared deviations), merged chunk by chunk
+#     with Chan et al.'s parallel form of Welford's update, plus min/max
+#   - a t-digest-style quantile sketch: at most ~compression weighted
+#     centroids, small near the tails and larger in the middle
+# so memory depends on the number of columns, not rows.
+
+STATS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+class QuantileSketch:
+    """Merging t-digest: weighted centroids compressed with the k1 scale function."""
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        if len(means) <= self.compression:
+            # Small enough to keep every point, so quantiles stay exact
+            self.means, self.weights = means, weights
+            return
+        total = weights.sum()
+        # Centroids whose left edge falls in the same unit of k share a bin,
+        # so bins are narrow where k changes fast (the tails)
+        q = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        bins = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, np.diff(bins) > 0])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q, lo=None, hi=None):
+        """Estimated q-quantile, interpolated between centroid midpoints (clamped to [lo, hi])."""
+        if not len(self.means):
+            return np.nan
+        if np.all(self.weights == 1):
+            return float(np.quantile(self.means, q))
+        total = self.weights.sum()
+        midpoints = np.cumsum(self.weights) - self.weights / 2
+        xs, ws = self.means, midpoints
+        if lo is not None:
+            xs, ws = np.r_[lo, xs], np.r_[0.0, ws]
+        if hi is not None:
+            xs, ws = np.r_[xs, hi], np.r_[ws, total]
+        return float(np.interp(q * total, ws, xs))
+
+
+class RunningStats:
+    """Per-column count/mean/variance/min/max and quantile sketches over DataFrame chunks."""
+
+    def __init__(self, columns, compression=200):
+        self.columns = list(columns)
+        n = len(self.columns)
+        self.count = np.zeros(n)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.min = np.full(n, np.inf)
+        self.max = np.full(n, -np.inf)
+        self.sketches = [QuantileSketch(compression) for _ in self.columns]
+
+    def update(self, chunk):
+        x = chunk[self.columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        valid = ~np.isnan(x)
+        n_b = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_b = np.where(n_b > 0, np.nansum(x, axis=0) / n_b, 0.0)
+            m2_b = np.nansum((x - mean_b) ** 2, axis=0)
+            n = self.count + n_b
+            delta = mean_b - self.mean
+            self.mean = np.where(n > 0, self.mean + delta * n_b / n, 0.0)
+            self.m2 = np.where(n > 0, self.m2 + m2_b + delta ** 2 * self.count * n_b / n, 0.0)
+        self.count = n
+        if valid.any():
+            self.min = np.fmin(self.min, np.nanmin(np.where(valid, x, np.inf), axis=0))
+            self.max = np.fmax(self.max, np.nanmax(np.where(valid, x, -np.inf), axis=0))
+        for i, sketch in enumerate(self.sketches):
+            sketch.update(x[valid[:, i], i])
+        return self
+
+    def summary(self):
+        """DataFrame laid out like df.describe(): STATS as the index, one column per input column."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        std = np.where(self.count > 1, std, np.nan)
+        empty = self.count == 0
+        data = {
+            "count": self.count,
+            "mean": np.where(empty, np.nan, self.mean),
+            "std": std,
+            "min": np.where(empty, np.nan, self.min),
+            "max": np.where(empty, np.nan, self.max),
+        }
+        for label, q in (("25%", .25), ("50%", .5), ("75%", .75)):
+            data[label] = [sketch.quantile(q, lo, hi) if not e else np.nan
+                           for sketch, lo, hi, e in zip(self.sketches, self.min, self.max, empty)]
+        return pd.DataFrame(data, index=self.columns).T.loc[STATS]
+
+
+def summarize(file_path, chunksize=100_000, compression=200):
+    """describe()-style numeric summary of a CSV in one chunked pass.
+
+    Numeric columns are those pandas infers as numeric in the first chunk;
+    unparsable values in later chunks count as missing. Returns
+    (summary DataFrame, number of rows).
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"The file {file_path} was not found.")
+    stats = None
+    rows = 0
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        if stats is None:
+            stats = RunningStats(chunk.select_dtypes("number").columns, compression)
+        stats.update(chunk)
+        rows += len(chunk)
+    if stats is None:
+        return pd.DataFrame(index=STATS), 0
+    return stats.summary(), rows
@@ -0,0 +1,70 @@
+import argparse
+import time
+import numpy as np
+from intent_index import IntentIndex
+from matchers import ExactMatcher, RandomProjectionMatcher
+
+# Benchmark: exact vs LSH intent matching on synthetic knowledge bases.
+# Text is generated already "preprocessed", so spaCy is not involved.
+
+
+def synthetic_examples(n_examples, n_intents=200, vocab_size=20000, words=6, seed=0):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(vocab_size)])
+    # Each intent draws most of its words from its own small topic vocabulary
+    topics = rng.integers(0, vocab_size, size=(n_intents, 30))
+    intent_examples = {f"intent_{i}": [] for i in range(n_intents)}
+    for n in range(n_examples):
+        intent = n % n_intents
+        picks = np.where(rng.random(words) < 0.8,
+                         rng.choice(topics[intent], size=words),
+                         rng.integers(0, vocab_size, size=words))
+        intent_examples[f"intent_{intent}"].append(' '.join(vocab[picks]))
+    return intent_examples
+
+
+def queries_from(intent_examples, n_queries, seed=1):
+    # Queries are examples with one word dropped
+    rng = np.random.default_rng(seed)
+    examples = [example for examples in intent_examples.values() for example in examples]
+    queries = []
+    for i in rng.integers(0, len(examples), size=n_queries):
+        words = examples[i].split()
+        del words[rng.integers(0, len(words))]
+        queries.append(' '.join(words))
+    return queries
+
+
+def run(sizes, n_queries, n_tables, n_bits):
+    print(f"{'examples':>9} {'matcher':>16} {'build s':>8} {'queries/s':>10} {'agreement':>10}")
+    for size in sizes:
+        intent_examples = synthetic_examples(size)
+        queries = queries_from(intent_examples, n_queries)
+        reference = None
+        for name, matcher in [('exact', ExactMatcher()),
+                              (f'lsh {n_tables}x{n_bits}', RandomProjectionMatcher(n_tables, n_bits))]:
+            index = IntentIndex(lambda text: text, matcher=matcher, threshold=0.0)
+            start = time.perf_counter()
+            index.fit(intent_examples)
+            index.match('warm up')
+            build_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = [index.match(query)[0] for query in queries]
+            elapsed = time.perf_counter() - start
+
+            if reference is None:
+                reference = results
+            agreement = np.mean([a == b for a, b in zip(results, reference)])
+            print(f"{size:>9} {name:>16} {build_time:>8.2f} {n_queries / elapsed:>10.1f} {agreement:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare exact and LSH intent matchers")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--tables', type=int, default=8)
+    parser.add_argument('--bits', type=int, default=12)
+    args = parser.parse_args()
+
+    run(args.sizes, args.queries, args.tables, args.bits)
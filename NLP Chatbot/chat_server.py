@@ -0,0 +1,86 @@
+import asyncio
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing the chatbot loads the spaCy model once; every session shares it
+from nlpchatbot import build_index, get_response, intent_examples, intent_index, lemma_cache
+
+# Protocol: newline-delimited JSON.
+#   request:  {"message": "hello"}
+#   response: {"intent": "greeting", "score": 1.0, "response": "Hi there!"}
+
+
+class ChatServer:
+    """Asyncio chatbot server; CPU-bound intent matching runs in a worker pool."""
+
+    def __init__(self, workers=None):
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+        self.sessions = 0
+        self.requests = 0
+
+    async def handle_message(self, message):
+        loop = asyncio.get_running_loop()
+        if message.lower() in intent_examples['farewell']:
+            return {'intent': 'farewell', 'score': 1.0,
+                    'response': "Goodbye! Thanks for chatting with me.", 'end': True}
+        intent, score = await loop.run_in_executor(self.executor, intent_index.match, message)
+        return {'intent': intent, 'score': score, 'response': get_response(intent)}
+
+    async def handle_session(self, reader, writer):
+        self.sessions += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)['message']
+                    reply = await self.handle_message(str(message))
+                except (ValueError, KeyError, TypeError):
+                    reply = {'error': 'expected {"message": "..."}'}
+                self.requests += 1
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+                if reply.get('end'):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix_path=None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_session, path=unix_path)
+            print(f"Spacy Chatbot server listening on {unix_path}")
+        else:
+            server = await asyncio.start_server(self.handle_session, host, port)
+            print(f"Spacy Chatbot server listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-session chatbot server (newline-delimited JSON)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH', help="listen on a local socket instead of TCP")
+    parser.add_argument('--workers', type=int, help="worker threads for preprocessing (default: CPU count)")
+    parser.add_argument('--cache-file', help="persist the lemma cache to this JSON file")
+    parser.add_argument('--matcher', choices=['exact', 'lsh'], default='exact')
+    args = parser.parse_args()
+
+    build_index(args.cache_file, args.matcher)
+    chat_server = ChatServer(args.workers)
+    try:
+        asyncio.run(chat_server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        chat_server.close()
+        lemma_cache.save()
@@ -0,0 +1,159 @@
+import re
+import threading
+import numpy as np
+import scipy.sparse as sp
+from matchers import ExactMatcher
+
+# Same token pattern TfidfVectorizer uses by default
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+class IntentIndex:
+    """TF-IDF index over intent examples, built once and queried per message."""
+
+    def __init__(self, preprocess, preprocess_many=None, threshold=0.2, default_intent='default', matcher=None):
+        self.preprocess = preprocess
+        # Bulk preprocessing (e.g. nlp.pipe); falls back to one call per text
+        self.preprocess_many = preprocess_many or (lambda texts: [preprocess(text) for text in texts])
+        self.threshold = threshold
+        self.default_intent = default_intent
+        # Nearest-example search backend (see matchers.py)
+        self.matcher = matcher or ExactMatcher()
+
+        self.vocabulary = {}  # term -> column
+        self.labels = []  # intent of each example row
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.counts = sp.csr_matrix((0, 0), dtype=np.float64)  # raw term counts
+        self.idf = np.zeros(0)
+        self.matrix = None  # L2-normalized TF-IDF rows, rebuilt lazily
+        # chat_server.py queries from several worker threads; only one rebuilds
+        self.lock = threading.Lock()
+
+    def fit(self, intent_examples):
+        """Build the index from a {intent: [examples]} mapping."""
+        self.vocabulary = {}
+        self.labels = []
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.counts = sp.csr_matrix((0, 0), dtype=np.float64)
+        for intent, examples in intent_examples.items():
+            self.add_intent(intent, examples)
+        return self
+
+    # ---- incremental updates ----
+
+    def add_intent(self, intent, examples):
+        """Append examples for an intent without touching existing rows."""
+        rows = [self._count_row(text, grow=True) for text in self.preprocess_many(list(examples))]
+        if not rows:
+            return
+        n_terms = len(self.vocabulary)
+        new_counts = self._stack(rows, n_terms)
+        self.counts.resize((self.counts.shape[0], n_terms))
+        self.counts = sp.vstack([self.counts, new_counts], format='csr')
+
+        self.doc_freq = np.concatenate([self.doc_freq, np.zeros(n_terms - len(self.doc_freq), dtype=np.int64)])
+        self.doc_freq += np.bincount(new_counts.indices, minlength=n_terms)
+        self.labels.extend([intent] * len(rows))
+        self.matrix = None
+
+    def remove_intent(self, intent):
+        """Drop every example of an intent; vocabulary columns are kept."""
+        keep = np.array([label != intent for label in self.labels], dtype=bool)
+        if keep.all():
+            return
+        removed = self.counts[~keep]
+        self.doc_freq -= np.bincount(removed.indices, minlength=len(self.doc_freq))
+        self.counts = self.counts[keep]
+        self.labels = [label for label in self.labels if label != intent]
+        self.matrix = None
+
+    # ---- scoring ----
+
+    def scores(self, user_input):
+        """Exact cosine similarity of the input against every example."""
+        queries = self._query_matrix([self.preprocess(user_input)])
+        return (queries @ self._normalized().T).toarray()[0]
+
+    def match(self, user_input):
+        """Return (intent, score) of the most similar example."""
+        return self.match_processed([self.preprocess(user_input)])[0]
+
+    def match_many(self, user_inputs):
+        """Match a batch of inputs with one bulk preprocess and one matcher search."""
+        user_inputs = list(user_inputs)
+        if not user_inputs:
+            return []
+        return self.match_processed(self.preprocess_many(user_inputs))
+
+    def match_processed(self, processed_texts):
+        """Match texts that have already been through preprocess()."""
+        best_idx, best_scores = self.matcher.search(self._query_matrix(processed_texts))
+        return [(self.labels[i], float(score)) if score >= self.threshold else (self.default_intent, float(score))
+                for i, score in zip(best_idx, best_scores)]
+
+    def set_matcher(self, matcher):
+        """Swap the search backend, building it first if the index is already built."""
+        with self.lock:
+            if self.matrix is not None:
+                matcher.build(self.matrix)
+            self.matcher = matcher
+
+    def warm(self):
+        """Build the normalized matrix and matcher now instead of on the first query."""
+        self._normalized()
+        return self
+
+    def get_intent(self, user_input):
+        return self.match(user_input)[0]
+
+    # ---- internals ----
+
+    def _count_row(self, processed_text, grow):
+        # Map tokens to column ids; unknown terms are dropped unless growing
+        row = {}
+        for term in TOKEN_PATTERN.findall(processed_text.lower()):
+            col = self.vocabulary.get(term)
+            if col is None:
+                if not grow:
+                    continue
+                col = self.vocabulary[term] = len(self.vocabulary)
+            row[col] = row.get(col, 0) + 1
+        return row
+
+    def _query_matrix(self, processed_texts):
+        # L2-normalized TF-IDF rows for the queries, using the index's idf
+        self._normalized()
+        rows = [self._count_row(text, grow=False) for text in processed_texts]
+        queries = self._stack(rows, len(self.vocabulary)).multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(queries.multiply(queries).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return (sp.diags(1 / norms) @ queries).tocsr()
+
+    @staticmethod
+    def _stack(rows, n_terms):
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.fromiter((col for row in rows for col in row), dtype=np.int64, count=indptr[-1])
+        data = np.fromiter((n for row in rows for n in row.values()), dtype=np.float64, count=indptr[-1])
+        matrix = sp.csr_matrix((data, indices, indptr), shape=(len(rows), n_terms))
+        matrix.sort_indices()
+        return matrix
+
+    def _normalized(self):
+        # Recompute idf and row norms from the stored counts (no re-preprocessing)
+        matrix = self.matrix
+        if matrix is not None:
+            return matrix
+        with self.lock:
+            if self.matrix is None:
+                n_docs = self.counts.shape[0]
+                idf = np.log((1 + n_docs) / (1 + self.doc_freq)) + 1
+                weighted = self.counts.multiply(idf).tocsr()
+                norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+                norms[norms == 0] = 1
+                matrix = (sp.diags(1 / norms) @ weighted).tocsr()
+                self.matcher.build(matrix)
+                # Publish only once the matcher is ready; other threads skip the lock on self.matrix
+                self.idf = idf
+                self.matrix = matrix
+            return self.matrix
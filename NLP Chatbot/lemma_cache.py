@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+def normalize(text):
+    """Cache key: lower-cased text with whitespace collapsed."""
+    return ' '.join(text.lower().split())
+
+
+class LemmaCache:
+    """Size-bounded LRU cache of preprocess() results."""
+
+    def __init__(self, maxsize=10000, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Sessions in chat_server.py preprocess from several worker threads
+        self.lock = threading.Lock()
+        if path:
+            self.load(path)
+
+    def get(self, text):
+        """Return the cached result for text, or None on a miss."""
+        key = normalize(text)
+        with self.lock:
+            try:
+                value = self.entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, text, value):
+        key = normalize(text)
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        # Drop least recently used entries beyond maxsize; caller holds the lock
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def cached(self, text, compute):
+        """Return the cached value for text, computing it from the normalized text on a miss."""
+        value = self.get(text)
+        if value is None:
+            value = compute(normalize(text))
+            self.put(text, value)
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    # ---- persistence ----
+
+    def load(self, path=None):
+        """Load entries saved by save(); a missing or corrupt file is ignored."""
+        path = path or self.path
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                items = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        # Saved oldest first, so the most recent entries survive a smaller maxsize
+        with self.lock:
+            for key, value in items[-self.maxsize:]:
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+            self._evict()
+
+    def save(self, path=None):
+        """Write entries to disk atomically, oldest first."""
+        path = path or self.path
+        if not path:
+            return
+        tmp_path = path + '.tmp'
+        with self.lock:
+            items = list(self.entries.items())
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(items, file)
+        os.replace(tmp_path, path)
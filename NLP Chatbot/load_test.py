@@ -0,0 +1,64 @@
+import asyncio
+import argparse
+import json
+import random
+import time
+
+# Messages drawn at random by each simulated client
+MESSAGES = ['hello', 'hi there', 'thanks', 'thank you so much', 'what is python',
+            'tell me about nlp', 'who are you', 'how does nlp work', 'good morning',
+            'what is the weather like']
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def client(host, port, unix_path, n_requests, latencies):
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n_requests):
+            request = json.dumps({'message': random.choice(MESSAGES)}).encode() + b'\n'
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            reply = await reader.readline()
+            latencies.append(time.perf_counter() - start)
+            if not reply:
+                break
+    finally:
+        writer.close()
+
+
+async def run(host, port, unix_path, clients, n_requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, unix_path, n_requests, latencies)
+                           for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Clients        : {clients}")
+    print(f"Requests       : {len(latencies)}")
+    print(f"Elapsed        : {elapsed:.3f}s")
+    print(f"Requests/sec   : {len(latencies) / elapsed:.1f}")
+    print(f"p50 latency    : {percentile(latencies, 50) * 1000:.2f} ms")
+    print(f"p99 latency    : {percentile(latencies, 99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for chat_server.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH')
+    parser.add_argument('-c', '--clients', type=int, default=10, help="concurrent clients")
+    parser.add_argument('-n', '--requests', type=int, default=100, help="requests per client")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.host, args.port, args.unix, args.clients, args.requests))
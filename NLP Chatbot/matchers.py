@@ -0,0 +1,100 @@
+import numpy as np
+import scipy.sparse as sp
+
+# Matcher backends for IntentIndex. Both take the L2-normalized example matrix
+# in build() and return (best_row, best_score) per query row in search().
+
+
+class ExactMatcher:
+    """Brute-force cosine similarity against every example."""
+
+    def build(self, matrix):
+        self.matrix = matrix
+
+    def search(self, queries):
+        n_queries = queries.shape[0]
+        if self.matrix.shape[0] == 0:
+            return np.zeros(n_queries, dtype=np.int64), np.zeros(n_queries)
+        scores = (queries @ self.matrix.T).toarray()
+        best = scores.argmax(axis=1)
+        return best, scores[np.arange(n_queries), best]
+
+
+class RandomProjectionMatcher:
+    """Approximate matcher using random-hyperplane LSH (SimHash).
+
+    Each of n_tables hashes a vector to the signs of n_bits random projections.
+    Only examples sharing a bucket with the query in some table are scored
+    exactly. More tables raise recall; more bits shrink buckets and speed up
+    queries at the cost of recall.
+    """
+
+    def __init__(self, n_tables=8, n_bits=12, seed=0):
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.rng = np.random.default_rng(seed)
+        # float64 to match the TF-IDF matrix, so scipy never upcasts a copy per query
+        self.planes = np.zeros((0, n_tables * n_bits))
+        self.weights = (1 << np.arange(n_bits, dtype=np.int64))
+
+    def build(self, matrix):
+        self.matrix = matrix
+        codes = self._codes(matrix)
+        # Per table: example ids sorted by bucket code, plus the start of each code run
+        self.tables = []
+        for table in range(self.n_tables):
+            order = np.argsort(codes[:, table], kind='stable')
+            sorted_codes = codes[order, table]
+            keys, starts = np.unique(sorted_codes, return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self.tables.append((keys, starts, ends, order))
+
+    def search(self, queries):
+        n_queries = queries.shape[0]
+        best = np.zeros(n_queries, dtype=np.int64)
+        best_scores = np.zeros(n_queries)
+        if self.matrix.shape[0] == 0:
+            return best, best_scores
+        codes = self._codes(queries)
+        for q in range(n_queries):
+            candidates = self._candidates(codes[q])
+            if candidates.size == 0:
+                continue
+            scores = (self.matrix[candidates] @ queries[q].T).toarray().ravel()
+            top = scores.argmax()
+            best[q], best_scores[q] = candidates[top], scores[top]
+        return best, best_scores
+
+    def _candidates(self, query_codes):
+        found = []
+        for (keys, starts, ends, order), code in zip(self.tables, query_codes):
+            pos = np.searchsorted(keys, code)
+            if pos < len(keys) and keys[pos] == code:
+                found.append(order[starts[pos]:ends[pos]])
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def _codes(self, matrix):
+        # Vocabulary grows as intents are added: extend the planes for new terms only
+        n_terms = matrix.shape[1]
+        if n_terms > self.planes.shape[0]:
+            extra = self.rng.standard_normal((n_terms - self.planes.shape[0], self.planes.shape[1]))
+            self.planes = np.vstack([self.planes, extra])
+        projected = sp.csr_matrix(matrix) @ self.planes[:n_terms]
+        bits = (np.asarray(projected) > 0).reshape(matrix.shape[0], self.n_tables, self.n_bits)
+        return bits @ self.weights
+
+
+MATCHERS = {
+    'exact': ExactMatcher,
+    'lsh': RandomProjectionMatcher,
+}
+
+
+def make_matcher(name, **options):
+    """Create a matcher backend by name ('exact' or 'lsh')."""
+    try:
+        return MATCHERS[name](**options)
+    except KeyError:
+        raise ValueError(f"Unknown matcher {name!r}; choose from {sorted(MATCHERS)}") from None
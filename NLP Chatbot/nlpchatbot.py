@@ -1,11 +1,22 @@
 import spacy
-import numpy as np
 import random
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import sys
+import time
+import argparse
+from intent_index import IntentIndex
+from lemma_cache import LemmaCache, normalize
+from matchers import make_matcher
 
-# Load Spacy English model
-nlp = spacy.load('en_core_web_sm')
+# Load Spacy English model; only lemmas and stop/punct flags are used,
+# so the dependency parser and NER are disabled
+nlp = spacy.load('en_core_web_sm', disable=['parser', 'ner'])
+
+# nlp.pipe settings for bulk preprocessing
+BATCH_SIZE = 256
+N_PROCESS = 1
+
+# Memoized preprocess() results; pass --cache-file to keep them across restarts
+lemma_cache = LemmaCache(maxsize=10000)
 
 # Sample knowledge base with intents and responses
 knowledge_base = {
@@ -37,44 +48,47 @@ intent_examples = {
 }
 
 # Preprocessing with Spacy
-def preprocess(text):
-    doc = nlp(text.lower())
+def lemmas(doc):
     # Get lemmatized tokens, excluding stop words and punctuation
     tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
     return ' '.join(tokens)
 
+def preprocess(text):
+    return lemma_cache.cached(text, lambda key: lemmas(nlp(key)))
+
+def preprocess_many(texts, batch_size=None, n_process=None):
+    # Bulk preprocessing through nlp.pipe, preserving input order;
+    # only texts missing from the cache are sent through spaCy
+    results = [lemma_cache.get(text) for text in texts]
+    missing = sorted({normalize(text) for text, result in zip(texts, results) if result is None})
+    docs = nlp.pipe(missing,
+                    batch_size=batch_size or BATCH_SIZE,
+                    n_process=n_process or N_PROCESS)
+    computed = {}
+    for key, doc in zip(missing, docs):
+        computed[key] = lemmas(doc)
+        lemma_cache.put(key, computed[key])
+    return [result if result is not None else computed[normalize(text)]
+            for text, result in zip(texts, results)]
+
+# TF-IDF index over the intent examples, built once by build_index();
+# queries only transform the user input
+intent_index = IntentIndex(preprocess, preprocess_many)
+
+def build_index(cache_file=None, matcher='exact'):
+    # Load persisted lemmas first so building the index hits the warm cache
+    if cache_file:
+        lemma_cache.path = cache_file
+        lemma_cache.load()
+    intent_index.set_matcher(make_matcher(matcher))
+    # Build the matrix and matcher up front so concurrent queries never see a half-built index
+    return intent_index.fit(intent_examples).warm()
+
 # Function to determine intent
 def get_intent(user_input):
-    # Preprocess user input
-    processed_input = preprocess(user_input)
-    
-    # Prepare examples for all intents
-    all_examples = []
-    intent_list = []
-    
-    for intent, examples in intent_examples.items():
-        for example in examples:
-            all_examples.append(preprocess(example))
-            intent_list.append(intent)
-    
-    # Add user input to create the TF-IDF matrix
-    all_examples.append(processed_input)
-    
-    # Create TF-IDF vectorizer
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(all_examples)
-    
-    # Calculate cosine similarity
-    similarity_scores = cosine_similarity(tfidf_matrix[-1], tfidf_matrix[:-1])
-    
-    # Find the most similar example
-    best_match_idx = np.argmax(similarity_scores)
-    
-    # If similarity is too low, return default intent
-    if similarity_scores.max() < 0.2:
-        return 'default'
-    
-    return intent_list[best_match_idx]
+    if not intent_index.labels:
+        build_index()
+    return intent_index.get_intent(user_input)
 
 def get_response(intent):
     # Return a random response for the given intent
@@ -93,7 +107,43 @@ def chatbot():
         response = get_response(intent)
         print(f"Spacy Chatbot: {response}")
 
+def classify_file(path, batch_size=None, n_process=None):
+    # Batch mode: classify one query per line and report throughput
+    with open(path, encoding='utf-8') as file:
+        queries = [line.strip() for line in file if line.strip()]
+
+    start = time.perf_counter()
+    processed = preprocess_many(queries, batch_size, n_process)
+    preprocess_time = time.perf_counter() - start
+    results = intent_index.match_processed(processed)
+    total_time = time.perf_counter() - start
+
+    for query, (intent, score) in zip(queries, results):
+        print(f"{query}\t{intent}\t{score:.3f}")
+    print(f"Preprocessed {len(queries)} docs in {preprocess_time:.3f}s "
+          f"({len(queries) / max(preprocess_time, 1e-9):.1f} docs/sec)", file=sys.stderr)
+    print(f"Classified {len(queries)} queries in {total_time:.3f}s "
+          f"({len(queries) / max(total_time, 1e-9):.1f} docs/sec)", file=sys.stderr)
+    print(f"Lemma cache: {lemma_cache.stats()}", file=sys.stderr)
+    return results
+
 if __name__ == "__main__":
     # Make sure to have the spacy model installed with:
     # python -m spacy download en_core_web_sm
-    chatbot()
+    parser = argparse.ArgumentParser(description="Spacy NLP chatbot")
+    parser.add_argument('--batch', metavar='FILE', help="classify one query per line instead of chatting")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--n-process', type=int, default=N_PROCESS)
+    parser.add_argument('--cache-file', help="persist the lemma cache to this JSON file")
+    parser.add_argument('--matcher', choices=['exact', 'lsh'], default='exact',
+                        help="intent search backend; 'lsh' is approximate but sublinear")
+    args = parser.parse_args()
+
+    build_index(args.cache_file, args.matcher)
+    try:
+        if args.batch:
+            classify_file(args.batch, args.batch_size, args.n_process)
+        else:
+            chatbot()
+    finally:
+        lemma_cache.save()
@@ -1,235 +1,212 @@
 #============================= IMPORT LIBRARIES =============================
 
+import startup  # first, so its timer starts with the process
+import sys
 import pandas as pd
-from sklearn import preprocessing
+from dataset_cache import load_cached
+from feature_encoder import DefectEncoder, encode_target, split_features
+from feature_selection import cached_chi2
+from evaluation import confusion, evaluate, write_summary
+from model_runner import LABELS, THRESHOLDS, run_models
+from model_store import ARTIFACT_DIR, save_preprocessing
+from report_figures import draw_comparison, draw_confusion, render_all
 import warnings
 warnings.filterwarnings("ignore")
 
-#============================= DATA SELECTION ==============================
 
-dataframe=pd.read_csv("Data.csv")
+def encode(dataframe):
+    # Numeric metrics pass through as float32; only the label is encoded
+    features,target=split_features(dataframe)
+    encoder=DefectEncoder().fit(features)
+    return encoder.transform(features),encode_target(target),encoder
 
-print("----------------------------------------------------")
-print("Input Data          ")
-print("----------------------------------------------------")
-print()
-print(dataframe.head(20))
 
-#============================= PREPROCESSING ==============================
+# The models train in worker processes, which re-import this module, so the
+# pipeline only runs under the __main__ guard at the bottom. With headless=True
+# no windows are opened: every figure is written to reports/ as PNG/SVG
+def main(headless=False):
 
-#==== checking missing values ====
+    #============================= DATA SELECTION ==============================
 
-print("----------------------------------------------------")
-print("Checking Missing Values          ")
-print("----------------------------------------------------")
-print()
-print(dataframe.isnull().sum())
+    # Parsed + encoded data is cached as memory-mapped .npy files and only
+    # rebuilt when Data.csv changes. Its watermark marks the rows the saved
+    # models have seen, so online_update.py can add later ones
+    dataset=load_cached("Data.csv",encode,encoding="defect-encoder")
+    watermark=dataset.watermark
+    startup.mark("data loaded")
 
-#==== label encoding ====
+    print("----------------------------------------------------")
+    print("Input Data          ")
+    print("----------------------------------------------------")
+    print()
+    print(dataset.head)
 
-print("----------------------------------------------------")
-print("Before Label Encoding          ")
-print("----------------------------------------------------")
-print()
-print(dataframe['defects'].head(15))
-print()
-label_encoder=preprocessing.LabelEncoder()
+    #============================= PREPROCESSING ==============================
 
-print("----------------------------------------------------")
-print("After Label Encoding          ")
-print("----------------------------------------------------")
-print()
-dataframe['defects']=label_encoder.fit_transform(dataframe['defects'])
+    #==== checking missing values ====
 
-# dataframe=dataframe.
+    print("----------------------------------------------------")
+    print("Checking Missing Values          ")
+    print("----------------------------------------------------")
+    print()
+    print(dataset.missing)
 
-dataframe=dataframe.apply(preprocessing.LabelEncoder().fit_transform)
-print(dataframe['defects'].head(15))
-print()
+    #==== label encoding ====
 
-#============================= FEATURE SELECTION ============================
+    print("----------------------------------------------------")
+    print("Before Label Encoding          ")
+    print("----------------------------------------------------")
+    print()
+    print(dataset.head['defects'].head(15))
+    print()
 
+    print("----------------------------------------------------")
+    print("After Label Encoding          ")
+    print("----------------------------------------------------")
+    print()
+    print(pd.Series(dataset.y[:15],name='defects'))
+    print()
 
-from sklearn.feature_selection import SelectKBest
-from sklearn.feature_selection import chi2
+    #============================= FEATURE SELECTION ============================
 
+    # Chi2 statistics are cached with a watermark into Data.csv and only
+    # updated with appended rows; the models train on the k selected columns
 
-x=dataframe.drop('defects',axis=1)
-y=dataframe['defects']
+    x=dataset.x
+    y=dataset.y
 
-chi2_features = SelectKBest(chi2,k=10)
+    chi2_features = cached_chi2("Data.csv",dataset.encoder,k=10,x=x,y=y)
+    selected = chi2_features.selected()
 
+    x_kbest= x[:,selected]
 
-x_kbest= chi2_features.fit_transform(x, y)
+    print("---------------------------------------------------")
+    print("Feature Selection --- > Chi Square")
+    print("---------------------------------------------------")
+    print()
+    print(" The original features is :", x.shape[1])
+    print()
+    print(" The reduced feature is   :",x_kbest.shape[1] )
+    print()
+    print(" Selected features        :",[dataset.columns[i] for i in selected])
+    print()
 
-print("---------------------------------------------------")
-print("Feature Selection --- > Chi Square")
-print("---------------------------------------------------")
-print()
-print(" The original features is :", x.shape[1])
-print()
-print(" The reduced feature is   :",x_kbest.shape[1] )
-print()
+    #============================ DATA SPLITTING ============================
 
-#============================ DATA SPLITTING ============================
 
+    from sklearn.model_selection import train_test_split
 
-from sklearn.model_selection import train_test_split
+    x_train,x_test,y_train,y_test=train_test_split(x_kbest,y,test_size=0.3,random_state=1)
 
-x_train,x_test,y_train,y_test=train_test_split(x,y,test_size=0.3,random_state=1)
+    print("---------------------------------------------------")
+    print("Data Splitting")
+    print("---------------------------------------------------")
+    print()
+    print("Total No.of dataset =", x.shape[0])
+    print()
+    print("Total No.of train data =", x_train.shape[0])
+    print()
+    print("Total No.of test data =", x_test.shape[0])
+    print()
 
-print("---------------------------------------------------")
-print("Data Splitting")
-print("---------------------------------------------------")
-print()
-print("Total No.of dataset =", x.shape[0])
-print()
-print("Total No.of train data =", x_train.shape[0])
-print()
-print("Total No.of test data =", x_test.shape[0])
-print()
 
+    #============================ CLASSIFICATION ============================
 
-#============================ CLASSIFICATION ============================
-
-# === ANN ===
-
-print("---------------------------------------------------")
-print("Deep Learning (ANN)")
-print("---------------------------------------------------")
-print()
-
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import  Dense
-classifier = Sequential() 
-classifier.add(Dense(activation = "relu", input_dim = 21, units = 8, kernel_initializer = "uniform")) 
-classifier.add(Dense(activation = "relu", units = 14,kernel_initializer = "uniform")) 
-classifier.add(Dense(activation = "sigmoid", units = 1,kernel_initializer = "uniform")) 
-classifier.compile(optimizer = 'adam' , loss = 'mae', metrics = ['mae','accuracy'] ) 
-history=classifier.fit(x_train,y_train, batch_size = 1000 ,epochs = 10 )
-
-acc_ann=history.history['accuracy']
-
-acc_ann=max(acc_ann)*100
-
-pred_ann=classifier.predict(x_test)
-
-y_pred1 = pred_ann.reshape(-1)
-y_pred1[y_pred1<0.5] = 0
-y_pred1[y_pred1>=0.5] = 1
-y_pred1 = y_pred1.astype('int')
-
-from sklearn.metrics import confusion_matrix
-
-cm1 = confusion_matrix(y_test,pred_ann)
-
-from sklearn import metrics
-
-acc_ann=metrics.accuracy_score(y_test,pred_ann)*100
-
-print("---------------------------------------------------")
-print("Performance Analysis ---> ANN ")
-print("---------------------------------------------------")
-
-print()
-print("1. Accuracy :",acc_ann )
-print()
-print("2.Classification report")
-print()
-print(metrics.classification_report(y_test,pred_ann))
-print()
-import seaborn as sns
-import matplotlib.pyplot as plt
-sns.heatmap(cm1, annot=True)
-plt.title("Artificial Neural Network")
-plt.show()
-
-
-
-
-
-# ==== SVM ====
-
-from sklearn.svm import SVC
-
-svc_model = SVC(C= .1, kernel='linear', gamma= 1)
-svc_model.fit(x_train[0:200], y_train[0:200])
-
-y_pred_svm=svc_model.predict(x_train[0:200])
-
-from sklearn import metrics
-acc_svm=metrics.accuracy_score(y_pred_svm,y_train[0:200])*100
-
-print("---------------------------------------------------")
-print("Performance Analysis ---> SVM ")
-print("---------------------------------------------------")
-print()
-
-print("1.Accuracy",acc_svm)
-print()
-print("2.Classification report")
-print()
-print(metrics.classification_report(y_train[0:200],y_pred_svm))
-print()
-cm1 = confusion_matrix(y_train[0:200],y_pred_svm)
-
-sns.heatmap(cm1, annot=True)
-plt.title("Support Vector Machine")
-plt.show()
-
-#======================== PREDICTION =============================
-
-print("---------------------------------------------------")
-print("Prediction")
-print("---------------------------------------------------")
-print()
-
-for i in range(10,20):
-    if y_pred_svm[i]==0:
-        print("----------------------")
+    # ANN, linear SVM (full training set) and SGD train concurrently, one
+    # process each; the table records accuracy, fit/predict time and peak RSS.
+    # Trained models and preprocessing state are saved for score.py
+
+    print("---------------------------------------------------")
+    print("Training ANN, SVM and SGD in parallel")
+    print("---------------------------------------------------")
+    print()
+
+    models=["ann","linear_svm","sgd"]
+    results,predictions,scores=run_models(models,x_train,y_train,x_test,y_test,
+                                   params={"ann":{"epochs":10,"batch_size":1000}},
+                                   save_dir=ARTIFACT_DIR)
+    save_preprocessing(dataset.encoder,chi2_features,selected,artifact_dir=ARTIFACT_DIR,watermark=watermark)
+    startup.mark("models trained")
+
+    from sklearn import metrics
+    if not headless:
+        import matplotlib.pyplot as plt
+
+    figures=[]
+    for name in models:
+        print("---------------------------------------------------")
+        print("Performance Analysis --->",LABELS[name])
+        print("---------------------------------------------------")
         print()
-        print([i],"No Software Defects")
-    elif y_pred_svm[i]==1:
-        print("----------------------")
+        print("1. Accuracy :",results.loc[name,"accuracy"])
+        print()
+        print("2.Classification report")
+        print()
+        print(metrics.classification_report(y_test,predictions[name]))
         print()
-        print([i],"Software Defects")
-
-print()
-print("-----------------------------------------------------------------------")
-print()
-
-
-import matplotlib.pyplot as plt
-vals=[acc_ann,acc_svm]
-inds=range(len(vals))
-labels=["ANN ","SVM"]
-fig,ax = plt.subplots()
-rects = ax.bar(inds, vals)
-ax.set_xticks([ind for ind in inds])
-ax.set_xticklabels(labels)
-plt.title('Comparison graph')
-plt.show() 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
 
+        cm1 = confusion(y_test,predictions[name])
+        if headless:
+            figures.append(("confusion",(cm1,LABELS[name]),"confusion_"+name))
+        else:
+            fig,ax = plt.subplots()
+            draw_confusion(ax,cm1,LABELS[name])
+            plt.show()
+
+    print("---------------------------------------------------")
+    print("Model Comparison")
+    print("---------------------------------------------------")
+    print()
+    print(results.rename(index=LABELS).round(3).to_string())
+    print()
+
+    #======================== PREDICTION =============================
+
+    print("---------------------------------------------------")
+    print("Prediction")
+    print("---------------------------------------------------")
+    print()
+
+    # One vectorized pass per model over the test scores (confusion counts,
+    # ROC/PR areas, best thresholds) instead of printing rows one by one;
+    # the full summary goes to reports/evaluation.json and .csv
+
+    summaries={name:evaluate(y_test,scores[name],THRESHOLDS[name]) for name in models}
+    columns=["positives","tp","fp","fn","precision","recall","f1","roc_auc","average_precision","best_f1_threshold"]
+    print(pd.DataFrame.from_dict(summaries,orient="index").rename(index=LABELS)[columns].to_string(float_format="%.3f"))
+    print()
+
+    y_pred_svm=predictions["linear_svm"]
+    print(int(y_pred_svm.sum()),"of",len(y_pred_svm),"test modules predicted with Software Defects (SVM)")
+    print()
+    for path in write_summary(summaries,"reports/evaluation"):
+        print("Saved",path)
+
+    print()
+    print("-----------------------------------------------------------------------")
+    print()
+
+
+    # Accuracy bar chart, driven by the comparison table
+    vals=results["accuracy"].tolist()
+    labels=[LABELS[name] for name in results.index]
+    if headless:
+        figures.append(("comparison",(labels,vals),"comparison"))
+        # Rendered together in a process pool once all results are in
+        for path in render_all(figures):
+            print("Saved",path)
+        startup.mark("figures written")
+    else:
+        fig,ax = plt.subplots()
+        draw_comparison(ax,labels,vals)
+        plt.show()
+
+
+if __name__ == "__main__":
+    # TensorFlow is only imported inside the ANN worker and the plotting
+    # libraries inside main(); --startup-time prints where the time went.
+    # --headless writes the figures to files instead of showing them
+    startup.mark("imports done")
+    main(headless="--headless" in sys.argv)
+    if "--startup-time" in sys.argv:
+        startup.report()
@@ -1,27 +1,18 @@
+import startup  # first, so its timer starts with the process
+import os
+import sys
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import sqlite3
-import pandas as pd
-from sklearn import preprocessing
-from sklearn.feature_selection import SelectKBest, chi2
-from sklearn.model_selection import train_test_split
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Database Setup
-def setup_database():
-    conn = sqlite3.connect("user_data.db")
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users (
-                 id INTEGER PRIMARY KEY,
-                 username TEXT UNIQUE,
-                 password TEXT)''')
-    conn.commit()
-    conn.close()
-
-setup_database()
+from auth_store import AuthStore
+from jobs import JobQueue, keras_progress
+from report_figures import render_all
+from startup import ml, pyplot, warm_up
+
+# TensorFlow, scikit-learn, pandas and matplotlib are imported on first use
+# (see startup.py) so the login window appears immediately. Measure with
+#   python MainGui.py --startup-time
+# or, per module, python -X importtime MainGui.py
 
 # Main Application Class
 class App:
@@ -34,6 +25,18 @@ class App:
         self.username = tk.StringVar()
         self.password = tk.StringVar()
 
+        # One persistent connection; password hashing runs on its own worker
+        # so the window stays responsive while a login is checked
+        self.auth = AuthStore("user_data.db")
+        self.auth_jobs = JobQueue(self.root, self.on_auth_event)
+
+        # Uploaded files are processed on a background worker, one at a time;
+        # progress comes back through the queue polled on the Tk thread
+        self.jobs = JobQueue(self.root, self.on_job_event)
+        self.job_status = {}
+        self.job_list = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.create_login_ui()
 
     def create_login_ui(self):
@@ -65,95 +68,188 @@ class App:
         tk.Button(self.root, text="Back to Login", command=self.create_login_ui, bg="#f44336", fg="white").pack(pady=10)
 
     def clear_frame(self):
+        self.job_list = None
         for widget in self.root.winfo_children():
             widget.destroy()
 
+    def on_close(self):
+        self.jobs.shutdown()
+        self.auth_jobs.shutdown()
+        self.auth.close()
+        self.root.destroy()
+
     def login(self):
         username = self.username.get()
         password = self.password.get()
-        conn = sqlite3.connect("user_data.db")
-        c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE username=? AND password=?", (username, password))
-        user = c.fetchone()
-        conn.close()
-
-        if user:
-            messagebox.showinfo("Login Successful", "Welcome, {}!".format(username))
-            self.create_home_ui()
-        else:
-            messagebox.showerror("Error", "Invalid credentials")
+        self.auth_jobs.submit('login', lambda job: self.auth.authenticate(username, password))
 
     def signup(self):
         username = self.username.get()
         password = self.password.get()
-        conn = sqlite3.connect("user_data.db")
-        c = conn.cursor()
-        try:
-            c.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password))
-            conn.commit()
+        self.auth_jobs.submit('signup', lambda job: self.auth.create_user(username, password))
+
+    def on_auth_event(self, job, kind, data):
+        # Runs on the Tk thread once the worker has checked the password
+        if job.name == 'login' and kind == 'done':
+            if data['result']:
+                # Start loading the ML stack while the user picks a file
+                warm_up()
+                messagebox.showinfo("Login Successful", "Welcome, {}!".format(self.username.get()))
+                self.create_home_ui()
+            else:
+                messagebox.showerror("Error", "Invalid credentials")
+        elif job.name == 'signup' and kind == 'done':
             messagebox.showinfo("Success", "Sign up successful")
             self.create_login_ui()
-        except sqlite3.IntegrityError:
-            messagebox.showerror("Error", "Username already exists")
-        finally:
-            conn.close()
+        elif kind == 'error':
+            if isinstance(data['error'], sqlite3.IntegrityError):
+                messagebox.showerror("Error", "Username already exists")
+            else:
+                messagebox.showerror("Error", str(data['error']))
 
     def create_home_ui(self):
         self.clear_frame()
 
         tk.Label(self.root, text="Home", font=("Arial", 20), bg="#f0f0f0").pack(pady=20)
         tk.Button(self.root, text="Upload CSV File", command=self.upload_file, bg="#4caf50", fg="white").pack(pady=10)
+
+        tk.Label(self.root, text="Jobs", bg="#f0f0f0").pack()
+        self.job_list = tk.Listbox(self.root, width=50, height=6)
+        self.job_list.pack(pady=5)
+        tk.Button(self.root, text="Cancel Selected Job", command=self.cancel_job, bg="#ff9800", fg="white").pack(pady=5)
+        self.refresh_jobs()
+
         tk.Button(self.root, text="Logout", command=self.create_login_ui, bg="#f44336", fg="white").pack(pady=10)
 
     def upload_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if file_path:
-            self.process_file(file_path)
-
-    def process_file(self, file_path):
-        dataframe = pd.read_csv(file_path)
-        messagebox.showinfo("File Upload", "File uploaded successfully")
+            job = self.jobs.submit(os.path.basename(file_path), self.process_file, file_path)
+            self.job_status[job.id] = "queued"
+            self.refresh_jobs()
+
+    def cancel_job(self):
+        if self.job_list is None or not self.job_list.curselection():
+            return
+        job_id = list(self.jobs.jobs)[self.job_list.curselection()[0]]
+        self.jobs.cancel(job_id)
+        if self.jobs.jobs[job_id].state == 'queued':
+            self.job_status[job_id] = "cancelling"
+            self.refresh_jobs()
+
+    def refresh_jobs(self):
+        if self.job_list is None or not self.job_list.winfo_exists():
+            return
+        selection = self.job_list.curselection()
+        self.job_list.delete(0, tk.END)
+        for job_id, job in self.jobs.jobs.items():
+            self.job_list.insert(tk.END, f"#{job_id} {job.name}: {self.job_status.get(job_id, job.state)}")
+        for index in selection:
+            self.job_list.selection_set(index)
+
+    def on_job_event(self, job, kind, data):
+        # Runs on the Tk thread (polled by JobQueue)
+        if kind == 'started':
+            self.job_status[job.id] = "running"
+        elif kind == 'stage':
+            self.job_status[job.id] = data['text']
+        elif kind == 'epoch':
+            self.job_status[job.id] = "epoch {}/{} accuracy {:.3f}".format(
+                data['epoch'], data['epochs'], data['logs'].get('accuracy', 0))
+        elif kind == 'cancelled':
+            self.job_status[job.id] = "cancelled"
+        elif kind == 'error':
+            self.job_status[job.id] = "failed"
+            print(data['traceback'])
+            messagebox.showerror("Error", "{} failed: {}".format(job.name, data['error']))
+        elif kind == 'done':
+            acc_ann, history = data['result']
+            self.job_status[job.id] = "done, accuracy {:.2f}%".format(acc_ann)
+            self.show_history(job.name, history)
+        self.refresh_jobs()
+
+    def show_history(self, name, history):
+        # Visualization (Tk thread; non-blocking so the window stays live)
+        plt = pyplot()
+        plt.figure()
+        plt.plot(history['accuracy'])
+        plt.title('ANN Training Accuracy - {}'.format(name))
+        plt.show(block=False)
+
+    def process_file(self, job, file_path):
+        # Worker thread: no Tk calls here, only job.report()
+        job.report('stage', text="loading")
+        m = ml()
+        dataframe, missing_values = m.data_loader.load_data(file_path)
 
         # Preprocessing
         print("Input Data:")
         print(dataframe.head(20))
 
         print("\nChecking Missing Values:")
-        print(dataframe.isnull().sum())
+        print(missing_values)
 
-        label_encoder = preprocessing.LabelEncoder()
-        dataframe = dataframe.apply(lambda col: label_encoder.fit_transform(col) if col.dtypes == 'object' else col)
+        # Fit-once encoder: category codes for categorical columns, float32
+        # pass-through (missing -> training median) for numeric metrics
+        job.check_cancelled()
+        job.report('stage', text="encoding")
+        features, target = m.feature_encoder.split_features(dataframe)
+        encoder = m.feature_encoder.DefectEncoder().fit(features)
+        x = encoder.transform(features)
+        y = m.feature_encoder.encode_target(target)
 
         print("\nData After Encoding:")
-        print(dataframe.head(20))
+        print(m.pd.DataFrame(x[:20], columns=encoder.feature_names_))
 
         # Feature Selection
-        x = dataframe.drop('defects', axis=1)
-        y = dataframe['defects']
-        x_kbest = SelectKBest(chi2, k=10).fit_transform(x, y)
+        job.check_cancelled()
+        job.report('stage', text="feature selection")
+        # One pass over the class sums; the ANN trains on the k selected columns
+        x_kbest = m.StreamingChi2(k=10).partial_fit(x, y).transform(x)
         print(f"Original Features: {x.shape[1]}, Reduced Features: {x_kbest.shape[1]}")
 
         # Data Splitting
-        x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.3, random_state=1)
+        x_train, x_test, y_train, y_test = m.train_test_split(x_kbest, y, test_size=0.3, random_state=1)
         print(f"Training Data: {x_train.shape[0]}, Test Data: {x_test.shape[0]}")
 
         # ANN Model
-        classifier = Sequential()
-        classifier.add(Dense(activation="relu", input_dim=x.shape[1], units=8, kernel_initializer="uniform"))
-        classifier.add(Dense(activation="relu", units=14, kernel_initializer="uniform"))
-        classifier.add(Dense(activation="sigmoid", units=1, kernel_initializer="uniform"))
+        job.check_cancelled()
+        job.report('stage', text="training")
+        epochs = 10
+        classifier = m.Sequential()
+        classifier.add(m.Input(shape=(x_kbest.shape[1],)))
+        # Standardize the raw metrics first, as model_runner.build_ann does
+        normalization = m.Normalization()
+        normalization.adapt(x_train)
+        classifier.add(normalization)
+        classifier.add(m.Dense(activation="relu", units=8, kernel_initializer="uniform"))
+        classifier.add(m.Dense(activation="relu", units=14, kernel_initializer="uniform"))
+        classifier.add(m.Dense(activation="sigmoid", units=1, kernel_initializer="uniform"))
         classifier.compile(optimizer='adam', loss='mae', metrics=['mae', 'accuracy'])
-        history = classifier.fit(x_train, y_train, batch_size=100, epochs=10, verbose=0)
+        history = classifier.fit(m.make_dataset(x_train, y_train, batch_size=100), epochs=epochs, verbose=0,
+                                 callbacks=[keras_progress(job, epochs)])
+        job.check_cancelled()
 
         acc_ann = max(history.history['accuracy']) * 100
         print(f"ANN Accuracy: {acc_ann:.2f}%")
 
-        # Visualization
-        plt.plot(history.history['accuracy'])
-        plt.title('ANN Training Accuracy')
-        plt.show()
+        # Keep a copy of the accuracy curve on disk (Agg, safe off the Tk thread)
+        job.report('stage', text="saving figure")
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        for path in render_all([("history", (history.history, 'ANN Training Accuracy - ' + name), "history_" + name)]):
+            print("Saved", path)
+        return acc_ann, history.history
 
 if __name__ == "__main__":
+    startup.mark("imports done")
     root = tk.Tk()
     app = App(root)
-    root.mainloop()
\ No newline at end of file
+    if "--startup-time" in sys.argv:
+        # Render the login window once, report timings and exit
+        root.update()
+        startup.mark("login window shown")
+        startup.ml()
+        startup.report()
+        root.destroy()
+    else:
+        root.mainloop()
\ No newline at end of file
@@ -0,0 +1,41 @@
+import json
+import os
+import pickle
+from contextlib import contextmanager
+
+#============================= ATOMIC FILE WRITES =======================
+#
+# Every persisted file (model artifacts, caches, memos, reports) is written
+# to a temporary file in the same directory and moved over the target with
+# os.replace, so readers see either the old file or the complete new one,
+# never a partial write. The temporary name keeps the extension, for
+# writers that insist on one (Keras .keras, np.savez .npz, savefig).
+
+
+@contextmanager
+def replacing(path):
+    """Yield a temporary path to write; on success it replaces path, on error it is removed."""
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.tmp{ext}"
+    try:
+        yield tmp_path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def atomic_write(path, write, mode='w', newline=None):
+    """Call write(file) on a temporary file, then move it over path in one step."""
+    with replacing(path) as tmp_path:
+        with open(tmp_path, mode, newline=newline) as file:
+            write(file)
+
+
+def write_json(data, path, **kwargs):
+    atomic_write(path, lambda file: json.dump(data, file, **kwargs))
+
+
+def write_pickle(obj, path):
+    atomic_write(path, lambda file: pickle.dump(obj, file), 'wb')
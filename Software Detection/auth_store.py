@@ -0,0 +1,111 @@
+import hashlib
+import hmac
+import os
+import sqlite3
+import threading
+
+#============================= PASSWORD HASHING =========================
+
+# Stored as "pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>" in the
+# existing password column; rows created before hashing hold the plaintext
+# and are upgraded on their next successful login.
+ALGORITHM = 'pbkdf2_sha256'
+ITERATIONS = 600_000
+
+
+def hash_password(password, iterations=ITERATIONS, salt=None):
+    salt = salt or os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def is_hashed(stored):
+    return stored.startswith(ALGORITHM + '$')
+
+
+def verify_password(password, stored):
+    """Constant-time check of password against a stored hash (or legacy plaintext)."""
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode(), stored.encode())
+    _, iterations, salt, digest = stored.split('$')
+    candidate = hashlib.pbkdf2_hmac('sha256', password.encode(), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(candidate.hex(), digest)
+
+
+#============================= AUTH STORE ===============================
+
+class AuthStore:
+    """User table behind one persistent WAL-mode SQLite connection.
+
+    Lookups go through the UNIQUE index on username only. Hashing is slow on
+    purpose, so callers on a UI thread should run create_user/authenticate on
+    a worker (MainGui uses a JobQueue). The connection is shared between
+    threads behind a lock; hashing happens outside it.
+    """
+
+    SELECT_USER = "SELECT password FROM users WHERE username = ?"
+    INSERT_USER = "INSERT INTO users (username, password) VALUES (?, ?)"
+    UPDATE_PASSWORD = "UPDATE users SET password = ? WHERE username = ?"
+
+    def __init__(self, path="user_data.db", iterations=ITERATIONS):
+        self.iterations = iterations
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute('''CREATE TABLE IF NOT EXISTS users (
+                             id INTEGER PRIMARY KEY,
+                             username TEXT UNIQUE,
+                             password TEXT)''')
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def lookup(self, username):
+        """Stored password hash for username, or None."""
+        with self.lock:
+            row = self.conn.execute(self.SELECT_USER, (username,)).fetchone()
+        return row[0] if row else None
+
+    def create_user(self, username, password):
+        """Add a user; raises sqlite3.IntegrityError if the name is taken."""
+        stored = hash_password(password, self.iterations)
+        with self.lock, self.conn:
+            self.conn.execute(self.INSERT_USER, (username, stored))
+
+    def authenticate(self, username, password):
+        stored = self.lookup(username)
+        if stored is None:
+            # Burn comparable time so unknown names are not distinguishable
+            hash_password(password, self.iterations)
+            return False
+        if not verify_password(password, stored):
+            return False
+        if not is_hashed(stored):
+            with self.lock, self.conn:
+                self.conn.execute(self.UPDATE_PASSWORD, (hash_password(password, self.iterations), username))
+        return True
+
+    def bulk_import(self, users, hashed=False, batch_size=10_000):
+        """Insert (username, password) pairs in batched transactions.
+
+        With hashed=True the passwords are already in stored form (e.g. an
+        export from another AuthStore) and are written as-is.
+        """
+        total = 0
+        batch = []
+        for username, password in users:
+            batch.append((username, password if hashed else hash_password(password, self.iterations)))
+            if len(batch) >= batch_size:
+                total += self._insert_many(batch)
+                batch = []
+        if batch:
+            total += self._insert_many(batch)
+        return total
+
+    def _insert_many(self, batch):
+        with self.lock, self.conn:
+            self.conn.executemany(self.INSERT_USER, batch)
+        return len(batch)
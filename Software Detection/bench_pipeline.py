@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from atomic_io import atomic_write, write_json
+from data_loader import CHUNKSIZE, NA_VALUES, TARGET, load_data, read_chunks
+
+# Stage-by-stage benchmark of the Main.py pipeline on synthetic Data.csv-format
+# files. Each dataset size runs in a fresh process; every stage records wall
+# time, CPU time and its own peak RSS. Results go to a JSON file, optionally
+# compared against a stored baseline:
+#
+#   python bench_pipeline.py --sizes 10000 100000 1000000 --save-baseline
+#   python bench_pipeline.py --sizes 10000 100000 1000000   # flags regressions
+
+BENCH_DIR = os.path.join('.dataset_cache', 'bench')
+BASELINE = 'bench_baseline.json'
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+#============================= SYNTHETIC DATA ===========================
+
+def synthesize(path, n_rows, source="Data.csv", seed=0, chunksize=CHUNKSIZE):
+    """Write n_rows rows resampled from source, keeping its schema, value mix and '?' rate."""
+    rng = np.random.default_rng(seed)
+    pool, _ = load_data(source)
+
+    def write(out):
+        for start in range(0, n_rows, chunksize):
+            chunk = pool.iloc[rng.integers(0, len(pool), min(chunksize, n_rows - start))]
+            chunk = chunk.assign(**{TARGET: chunk[TARGET].map({True: 'true', False: 'false'})})
+            chunk.to_csv(out, header=start == 0, index=False, na_rep=NA_VALUES[0])
+
+    atomic_write(path, write, newline='')
+    return path
+
+
+def synthetic_file(n_rows, bench_dir=BENCH_DIR, seed=0):
+    """Path of the synthetic file with n_rows rows, generated on first use."""
+    os.makedirs(bench_dir, exist_ok=True)
+    path = os.path.join(bench_dir, f"synthetic_{n_rows}_{seed}.csv")
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        synthesize(path, n_rows, seed=seed)
+        print(f"  generated {n_rows:,} rows in {time.perf_counter() - start:.1f}s -> {path}")
+    return path
+
+
+#============================= MEASUREMENT ==============================
+
+def _rss_mb():
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+class Stage:
+    """Context manager timing one stage and sampling its peak RSS every interval seconds.
+
+    Per-stage peaks need /proc (Linux); elsewhere the process high-water mark
+    from resource is reported instead.
+    """
+
+    def __init__(self, name, results, rows, interval=0.005):
+        self.name, self.results, self.rows, self.interval = name, results, rows, interval
+        self.sampling = os.path.exists('/proc/self/statm')
+
+    def _sample(self):
+        while not self.done.wait(self.interval):
+            self.peak = max(self.peak, _rss_mb())
+
+    def __enter__(self):
+        self.done = threading.Event()
+        if self.sampling:
+            self.peak = _rss_mb()
+            self.thread = threading.Thread(target=self._sample, daemon=True)
+            self.thread.start()
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall, cpu = time.perf_counter() - self.wall, time.process_time() - self.cpu
+        self.done.set()
+        if self.sampling:
+            self.thread.join()
+            peak = max(self.peak, _rss_mb())
+        else:
+            from model_runner import _peak_rss_mb
+            peak = _peak_rss_mb()
+        self.results.append({'rows': self.rows, 'stage': self.name, 'wall_s': wall, 'cpu_s': cpu,
+                             'peak_rss_mb': peak})
+        print(f"  {self.rows:>10,}  {self.name:<12} wall {wall:8.3f}s  cpu {cpu:8.3f}s  peak {peak:8.1f} MB")
+
+
+#============================= PIPELINE STAGES ==========================
+
+def run_stages(path, rows, epochs=2, batch_size=1000):
+    """Run the Main.py stages on path in this process; returns the per-stage records."""
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from feature_encoder import DefectEncoder, encode_target, split_features
+    from feature_selection import StreamingChi2
+    from input_pipeline import configure_threads, make_dataset
+    from model_runner import build_ann, build_linear_svm, fit_input_scaler
+
+    results = []
+    with Stage('load', results, rows):
+        dataframe = pd.concat(read_chunks(path), ignore_index=True)
+    with Stage('missing', results, rows):
+        dataframe.isnull().sum()
+    with Stage('encode', results, rows):
+        features, target = split_features(dataframe)
+        encoder = DefectEncoder().fit(features)
+        x, y = encoder.transform(features), encode_target(target)
+        del dataframe, features, target
+    with Stage('chi2', results, rows):
+        x = StreamingChi2(k=10).partial_fit(x, y).transform(x)
+    with Stage('split', results, rows):
+        x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=0.3, random_state=1)
+
+    configure_threads()
+    with Stage('ann_fit', results, rows):
+        model, _ = build_ann(x_train.shape[1])
+        fit_input_scaler(model, x_train)
+        model.fit(make_dataset(x_train, y_train, batch_size), epochs=epochs, verbose=0)
+    with Stage('ann_predict', results, rows):
+        model.predict(x_test, batch_size=10_000, verbose=0)
+    with Stage('svm_fit', results, rows):
+        model, _ = build_linear_svm(x_train.shape[1])
+        model.fit(x_train, y_train)
+    with Stage('svm_predict', results, rows):
+        model.predict(x_test)
+    return results
+
+
+def run_benchmark(sizes, epochs=2, bench_dir=BENCH_DIR):
+    results = []
+    for rows in sizes:
+        path = synthetic_file(rows, bench_dir)
+        # Fresh process per size, so earlier sizes do not inflate peak RSS
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+            results += executor.submit(run_stages, path, rows, epochs).result()
+    return {
+        'meta': {
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'epochs': epochs,
+        },
+        'results': results,
+    }
+
+
+#============================= BASELINE =================================
+
+def compare(report, baseline, tolerance=0.25, min_seconds=0.05, min_mb=20):
+    """Stages slower or bigger than baseline by more than tolerance; ignores tiny absolute changes."""
+    previous = {(r['rows'], r['stage']): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        old = previous.get((result['rows'], result['stage']))
+        if old is None:
+            continue
+        for key, floor in (('wall_s', min_seconds), ('peak_rss_mb', min_mb)):
+            if result[key] > old[key] * (1 + tolerance) and result[key] - old[key] > floor:
+                regressions.append({'rows': result['rows'], 'stage': result['stage'], 'metric': key,
+                                    'baseline': old[key], 'current': result[key],
+                                    'change': result[key] / old[key] - 1 if old[key] else float('inf')})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-stage time/memory benchmark of the defect pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="rows per synthetic dataset")
+    parser.add_argument('--epochs', type=int, default=2, help="ANN epochs per size")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed relative slowdown/growth")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, args.epochs)
+    if args.save_baseline:
+        write_json(report, args.baseline, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            report['regressions'] = compare(report, json.load(file), args.tolerance)
+        for r in report['regressions']:
+            print(f"REGRESSION {r['rows']:>10,} {r['stage']:<12} {r['metric']:<11} "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} ({r['change']:+.0%})")
+        if not report['regressions']:
+            print(f"No regressions against {args.baseline}")
+    write_json(report, args.output, indent=2)
+    print(f"Results written to {args.output}")
+    sys.exit(1 if report.get('regressions') else 0)
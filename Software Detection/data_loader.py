@@ -0,0 +1,154 @@
+import hashlib
+import io
+import os
+
+import pandas as pd
+
+#============================= DATA SCHEMA ==============================
+
+# Halstead / McCabe metric columns of Data.csv
+METRIC_COLUMNS = ['loc', 'v(g)', 'ev(g)', 'iv(g)', 'n', 'v', 'l', 'd', 'i', 'e', 'b', 't',
+                  'lOCode', 'lOComment', 'lOBlank', 'locCodeAndComment',
+                  'uniq_Op', 'uniq_Opnd', 'total_Op', 'total_Opnd', 'branchCount']
+TARGET = 'defects'
+
+# Compact dtypes: float32 metrics (half of pandas' float64/int64 default), bool label
+DTYPES = {col: 'float32' for col in METRIC_COLUMNS}
+DTYPES[TARGET] = 'bool'
+
+# Missing metrics are written as '?' in the exports
+NA_VALUES = ['?']
+
+CHUNKSIZE = 100_000
+
+
+#============================= CHUNKED LOADING ==========================
+
+def read_chunks(path, chunksize=CHUNKSIZE, usecols=None):
+    """Yield DataFrame chunks of the CSV with the compact dtypes applied."""
+    header = pd.read_csv(path, nrows=0).columns
+    dtype = {col: DTYPES[col] for col in header if col in DTYPES}
+    return pd.read_csv(path, dtype=dtype, na_values=NA_VALUES, chunksize=chunksize, usecols=usecols)
+
+
+def count_missing(chunks):
+    """Missing-value counts per column, accumulated chunk by chunk."""
+    missing = None
+    for chunk in chunks:
+        counts = chunk.isnull().sum()
+        missing = counts if missing is None else missing.add(counts, fill_value=0)
+    return missing.astype('int64')
+
+
+def concat_chunks(chunks):
+    """(dataframe, missing-value counts) of an iterable of chunks."""
+    frames = []
+
+    def kept_chunks():
+        for chunk in chunks:
+            frames.append(chunk)
+            yield chunk
+
+    missing = count_missing(kept_chunks())
+    return pd.concat(frames, ignore_index=True), missing
+
+
+def load_data(path, chunksize=CHUNKSIZE):
+    """Load the whole CSV chunk by chunk; returns (dataframe, missing-value counts)."""
+    return concat_chunks(read_chunks(path, chunksize))
+
+
+#============================= APPENDED ROWS ============================
+#
+# Metric exports grow by appending rows. A watermark records how far a
+# consumer has read: the byte offset just past the last complete row, the
+# number of rows before it and a fingerprint of the bytes leading up to it.
+# If the fingerprint no longer matches, the file was rewritten rather than
+# appended to and the consumer must start over.
+
+FINGERPRINT_BYTES = 1 << 16
+
+
+def _fingerprint(path, offset):
+    digest = hashlib.sha256(str(offset).encode())
+    with open(path, 'rb') as file:
+        digest.update(file.read(min(offset, FINGERPRINT_BYTES)))
+        file.seek(max(0, offset - FINGERPRINT_BYTES))
+        digest.update(file.read(min(offset, FINGERPRINT_BYTES)))
+    return digest.hexdigest()
+
+
+def _complete_rows_end(path):
+    # Offset just past the last newline, so a row being written is left for later
+    size = os.path.getsize(path)
+    with open(path, 'rb') as file:
+        position = size
+        while position > 0:
+            step = min(FINGERPRINT_BYTES, position)
+            file.seek(position - step)
+            block = file.read(step)
+            newline = block.rfind(b'\n')
+            if newline != -1:
+                return position - step + newline + 1
+            position -= step
+    return 0
+
+
+class _RangeReader(io.RawIOBase):
+    """File-like view of bytes [start, end) of a file, for pd.read_csv."""
+
+    def __init__(self, path, start, end):
+        self.file = open(path, 'rb')
+        self.file.seek(start)
+        self.remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self.file.readinto(memoryview(buffer)[:max(0, min(len(buffer), self.remaining))])
+        self.remaining -= n
+        return n
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def is_valid_watermark(path, watermark):
+    return (watermark is not None
+            and os.path.getsize(path) >= watermark['offset']
+            and _fingerprint(path, watermark['offset']) == watermark['fingerprint'])
+
+
+def read_appended(path, watermark=None, chunksize=CHUNKSIZE):
+    """Chunks of the rows added since watermark, plus the watermark after them.
+
+    With no (or a stale) watermark every row is returned. The new watermark
+    is only valid once the chunks have been consumed.
+    """
+    if not is_valid_watermark(path, watermark):
+        watermark = None
+    end = _complete_rows_end(path)
+    header = pd.read_csv(path, nrows=0).columns
+    dtype = {col: DTYPES[col] for col in header if col in DTYPES}
+    state = {'offset': end, 'rows': watermark['rows'] if watermark else 0,
+             'fingerprint': _fingerprint(path, end)}
+
+    def chunks():
+        if watermark is None:
+            reader = _RangeReader(path, 0, end)
+            options = {}
+        else:
+            reader = _RangeReader(path, watermark['offset'], end)
+            options = {'header': None, 'names': list(header)}
+        if reader.remaining <= 0 or (watermark is None and end == 0):
+            reader.close()
+            return
+        with io.BufferedReader(reader) as buffered:
+            for chunk in pd.read_csv(buffered, dtype=dtype, na_values=NA_VALUES, chunksize=chunksize, **options):
+                state['rows'] += len(chunk)
+                yield chunk
+
+    return chunks(), state
+
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CHUNKSIZE, concat_chunks, read_appended, read_chunks
+from atomic_io import replacing, write_json, write_pickle
+
+#============================= DATASET CACHE ============================
+#
+# Parsed and encoded datasets are stored next to the CSV as column-major
+# .npy files (one contiguous block per feature) that later runs open with
+# np.load(mmap_mode='r'). An entry is reused while the source file's
+# mtime/size are unchanged; if they changed, the content hash decides.
+# The fitted encoder is pickled alongside so scoring can reuse it.
+
+CACHE_DIR = '.dataset_cache'
+
+Dataset = namedtuple('Dataset', ['x', 'y', 'columns', 'missing', 'head', 'encoder', 'watermark'])
+
+
+def file_hash(path, block_size=1 << 20):
+    """SHA-256 of the file contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _entry_dir(path, encoding, cache_dir):
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{encoding}")
+
+
+def _read_meta(entry):
+    try:
+        with open(os.path.join(entry, 'meta.json'), 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_meta(entry, meta):
+    write_json(meta, os.path.join(entry, 'meta.json'))
+
+
+def _is_fresh(path, entry, meta):
+    stat = os.stat(path)
+    if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+        return True
+    # Touched but possibly unchanged: fall back to the content hash
+    if meta['size'] == stat.st_size and meta['sha256'] == file_hash(path):
+        meta['mtime_ns'] = stat.st_mtime_ns
+        _write_meta(entry, meta)
+        return True
+    return False
+
+
+def load_cached(path, encode, encoding, cache_dir=None, chunksize=CHUNKSIZE, verbose=True):
+    """Return the encoded Dataset for a CSV, parsing it only when the cache is stale.
+
+    encode(dataframe) must return (x, y, encoder) with x a 2-D feature array
+    and encoder the fitted transformer (or None); encoding names the scheme so
+    that different encoders never share an entry.
+
+    Only complete rows are loaded. The Dataset's watermark (see
+    data_loader.read_appended) comes from the same read, so its offset and
+    row count always describe exactly the rows in x and y.
+    """
+    entry = _entry_dir(path, encoding, cache_dir)
+    start = time.perf_counter()
+
+    meta = _read_meta(entry)
+    if meta is not None and 'watermark' in meta and _is_fresh(path, entry, meta):
+        x = np.load(os.path.join(entry, 'x.npy'), mmap_mode='r')
+        y = np.load(os.path.join(entry, 'y.npy'), mmap_mode='r')
+        head = next(iter(read_chunks(path, chunksize=20)))
+        with open(os.path.join(entry, 'encoder.pkl'), 'rb') as file:
+            encoder = pickle.load(file)
+        dataset = Dataset(x, y, meta['columns'], pd.Series(meta['missing'], dtype='int64'), head, encoder,
+                          meta['watermark'])
+        if verbose:
+            print(f"Dataset cache: warm load in {time.perf_counter() - start:.3f}s ({entry})")
+        return dataset
+
+    stat = os.stat(path)
+    source_hash = file_hash(path)
+    chunks, watermark = read_appended(path, chunksize=chunksize)
+    dataframe, missing = concat_chunks(chunks)
+    x, y, encoder = encode(dataframe)
+    columns = getattr(encoder, 'feature_names_', None) or [str(col) for col in range(x.shape[1])]
+    x = np.asfortranarray(np.asarray(x, dtype=np.float32))
+    y = np.asarray(y)
+
+    # Remove the old metadata first so a crash mid-write leaves no valid entry
+    shutil.rmtree(entry, ignore_errors=True)
+    os.makedirs(entry)
+    for name, array in (('x.npy', x), ('y.npy', y)):
+        with replacing(os.path.join(entry, name)) as tmp_path:
+            np.save(tmp_path, array)
+    write_pickle(encoder, os.path.join(entry, 'encoder.pkl'))
+    _write_meta(entry, {
+        'source': os.path.abspath(path),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': source_hash,
+        'columns': columns,
+        'missing': {str(col): int(n) for col, n in missing.items()},
+        'rows': int(x.shape[0]),
+        'watermark': watermark,
+    })
+    if verbose:
+        print(f"Dataset cache: cold load (parse + encode) in {time.perf_counter() - start:.3f}s ({entry})")
+    return Dataset(x, y, columns, missing, dataframe.head(20), encoder, watermark)
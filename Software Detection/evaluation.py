@@ -0,0 +1,129 @@
+import csv
+import os
+
+import numpy as np
+
+from atomic_io import atomic_write, write_json
+
+#============================= VECTORIZED EVALUATION ====================
+#
+# Binary defect predictions are evaluated from the score array alone: one
+# sort plus cumulative sums give the confusion counts at every distinct
+# threshold, from which ROC/PR curves, their areas and the best threshold
+# all follow without a Python loop over rows.
+
+
+def confusion(y_true, y_pred):
+    """[[tn, fp], [fn, tp]] from 0/1 labels and predictions."""
+    y_true = np.asarray(y_true, dtype=np.int64).reshape(-1)
+    y_pred = np.asarray(y_pred, dtype=np.int64).reshape(-1)
+    return np.bincount(2 * y_true + y_pred, minlength=4).reshape(2, 2)
+
+
+def threshold_curve(y_true, scores):
+    """Confusion counts for 'score >= t' at every distinct score t, highest t first.
+
+    The first point is t = +inf (predict no defects), so that is always a
+    candidate. Returns a dict of arrays: threshold, tp, fp, fn, tn.
+    """
+    y_true = np.asarray(y_true, dtype=bool).reshape(-1)
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    # Ties are grouped below, so their order within the sort does not matter
+    order = np.argsort(-scores)
+    scores, y_true = scores[order], y_true[order]
+    # Last index of each run of equal scores
+    last = np.append(np.flatnonzero(np.diff(scores)), len(scores) - 1) if len(scores) else np.zeros(0, np.int64)
+    tp = np.r_[0, np.cumsum(y_true)[last]]
+    fp = np.r_[0, last + 1 - tp[1:]]
+    positives = int(y_true.sum())
+    negatives = len(y_true) - positives
+    return {'threshold': np.r_[np.inf, scores[last]], 'tp': tp, 'fp': fp,
+            'fn': positives - tp, 'tn': negatives - fp}
+
+
+def _ratio(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / np.maximum(denominator, 1), 0.0)
+
+
+def roc_pr(curve):
+    """ROC (fpr, tpr) and PR (recall, precision) arrays plus their areas.
+
+    An area that is undefined because a class is missing is NaN, not 0.
+    """
+    tp, fp, fn, tn = curve['tp'], curve['fp'], curve['fn'], curve['tn']
+    tpr = _ratio(tp, tp + fn)
+    fpr = _ratio(fp, fp + tn)
+    recall = tpr
+    # Both curves start at the +inf threshold point: the origin, precision 1
+    precision = np.where(tp + fp > 0, _ratio(tp, tp + fp), 1.0)
+    positives, negatives = tp[0] + fn[0], fp[0] + tn[0]
+    return {
+        'fpr': fpr, 'tpr': tpr,
+        'roc_auc': float(np.trapezoid(tpr, fpr)) if positives and negatives else float('nan'),
+        'recall': recall, 'precision': precision,
+        # Average precision, as sklearn: sum of precision weighted by recall steps
+        'average_precision': float(np.sum(np.diff(recall) * precision[1:])) if positives else float('nan'),
+    }
+
+
+def best_threshold(curve, metric='f1'):
+    """(threshold, value) maximising metric ('f1', 'accuracy' or 'youden') over the curve."""
+    tp, fp, fn, tn = curve['tp'], curve['fp'], curve['fn'], curve['tn']
+    if metric == 'f1':
+        values = _ratio(2 * tp, 2 * tp + fp + fn)
+    elif metric == 'accuracy':
+        values = (tp + tn) / (tp + fp + fn + tn)
+    elif metric == 'youden':
+        values = _ratio(tp, tp + fn) - _ratio(fp, fp + tn)
+    else:
+        raise ValueError(f"unknown metric {metric!r}")
+    i = int(np.argmax(values))
+    return float(curve['threshold'][i]), float(values[i])
+
+
+def evaluate(y_true, scores, threshold=0.5):
+    """Summary dict for one model: metrics at threshold, curve areas and best thresholds."""
+    y_true = np.asarray(y_true).reshape(-1)
+    scores = np.asarray(scores).reshape(-1)
+    if not len(y_true):
+        raise ValueError("nothing to evaluate: no rows")
+    (tn, fp), (fn, tp) = confusion(y_true, scores >= threshold).tolist()
+    curve = threshold_curve(y_true, scores)
+    areas = roc_pr(curve)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    summary = {
+        'rows': len(y_true),
+        'positives': tp + fn,
+        'threshold': threshold,
+        'tn': tn, 'fp': fp, 'fn': fn, 'tp': tp,
+        'accuracy': (tp + tn) / max(len(y_true), 1),
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'roc_auc': areas['roc_auc'],
+        'average_precision': areas['average_precision'],
+    }
+    for metric in ('f1', 'accuracy', 'youden'):
+        summary[f'best_{metric}_threshold'], summary[f'best_{metric}'] = best_threshold(curve, metric)
+    return summary
+
+
+#============================= SUMMARY FILES ============================
+
+def write_summary(summaries, path):
+    """Write {model: summary} to path.json and path.csv (one row per model); returns both paths."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_json(summaries, path + '.json', indent=2)
+
+    def write_csv(file):
+        fields = ['model'] + list(next(iter(summaries.values())))
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for name, summary in summaries.items():
+            writer.writerow({'model': name, **summary})
+    atomic_write(path + '.csv', write_csv, newline='')
+    return path + '.json', path + '.csv'
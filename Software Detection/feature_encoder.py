@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from data_loader import TARGET
+
+
+class DefectEncoder(BaseEstimator, TransformerMixin):
+    """Fit-once feature encoder shared by training and scoring.
+
+    Categorical / boolean columns become vectorized category codes (unseen
+    values map to -1); numeric columns pass through unchanged as float32 with
+    missing values filled by the training median. transform() returns a
+    float32 array whose columns follow feature_names_.
+    """
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.feature_names_ = [str(col) for col in X.columns]
+        self.categories_ = {}
+        self.fill_values_ = {}
+        for col in X.columns:
+            column = X[col]
+            if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+                median = column.median()
+                self.fill_values_[str(col)] = np.float32(0 if pd.isna(median) else median)
+            else:
+                self.categories_[str(col)] = pd.Index(pd.unique(column.dropna())).sort_values()
+        return self
+
+    def transform(self, X):
+        X = pd.DataFrame(X)
+        out = np.empty((len(X), len(self.feature_names_)), dtype=np.float32, order='F')
+        for i, col in enumerate(self.feature_names_):
+            column = X[col]
+            if col in self.categories_:
+                out[:, i] = pd.Categorical(column, categories=self.categories_[col]).codes
+            else:
+                values = column.to_numpy(dtype=np.float32, na_value=np.nan)
+                out[:, i] = np.where(np.isnan(values), self.fill_values_[col], values)
+        return out
+
+
+def encode_target(y):
+    """Defect labels as int8 0/1 (accepts bool, 0/1 or 'true'/'false')."""
+    y = pd.Series(y)
+    if y.dtype == object or pd.api.types.is_string_dtype(y):
+        y = y.astype(str).str.lower().isin(['true', '1', 'yes'])
+    return y.to_numpy().astype(np.int8)
+
+
+def split_features(dataframe):
+    """Split a Data.csv frame into (features, target)."""
+    return dataframe.drop(TARGET, axis=1), dataframe[TARGET]
@@ -0,0 +1,105 @@
+import json
+import os
+
+import numpy as np
+from scipy.stats import chi2 as chi2_distribution
+
+from atomic_io import replacing
+from data_loader import CHUNKSIZE, TARGET, is_valid_watermark, read_appended
+from feature_encoder import encode_target
+
+#============================= STREAMING CHI2 ===========================
+#
+# sklearn's chi2 only needs per-class column sums and class counts:
+#   observed[c, j] = sum of feature j over rows of class c
+#   expected[c, j] = P(c) * sum of feature j over all rows
+# Keeping those sufficient statistics lets the scores be computed in one
+# pass and updated as rows are appended, without revisiting old rows.
+
+
+class StreamingChi2:
+    """SelectKBest(chi2, k) computed from incrementally updated statistics."""
+
+    def __init__(self, k=10, n_classes=2):
+        self.k = k
+        self.n_classes = n_classes
+        self.class_sums = None
+        self.class_counts = np.zeros(n_classes, dtype=np.int64)
+
+    def partial_fit(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.int64)
+        if self.class_sums is None:
+            self.class_sums = np.zeros((self.n_classes, x.shape[1]))
+        # Category codes are -1 for values unseen at fit time; chi2 needs x >= 0
+        x = np.maximum(x, 0)
+        for c in range(self.n_classes):
+            self.class_sums[c] += x[y == c].sum(axis=0)
+        self.class_counts += np.bincount(y, minlength=self.n_classes)
+        return self
+
+    def scores(self):
+        """(chi2 statistics, p-values) per feature, as sklearn.feature_selection.chi2."""
+        observed = self.class_sums
+        class_prob = self.class_counts / self.class_counts.sum()
+        expected = np.outer(class_prob, observed.sum(axis=0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = (observed - expected) ** 2 / expected
+        statistics = np.nansum(terms, axis=0)
+        return statistics, chi2_distribution.sf(statistics, self.n_classes - 1)
+
+    def selected(self):
+        """Column indices of the k best features, in original column order."""
+        statistics = np.nan_to_num(self.scores()[0], nan=0.0)
+        k = min(self.k, len(statistics))
+        return np.sort(np.argsort(statistics, kind='mergesort')[len(statistics) - k:])
+
+    def transform(self, x):
+        return np.asarray(x)[:, self.selected()]
+
+    # ---- persistence ----
+
+    def save(self, path, watermark=None):
+        with replacing(path) as tmp_path:
+            np.savez(tmp_path, class_sums=self.class_sums, class_counts=self.class_counts,
+                     k=self.k, watermark=json.dumps(watermark))
+
+    @classmethod
+    def load(cls, path):
+        """Return (selector, watermark) saved by save()."""
+        with np.load(path) as arrays:
+            selector = cls(int(arrays['k']), len(arrays['class_counts']))
+            selector.class_sums = arrays['class_sums']
+            selector.class_counts = arrays['class_counts']
+            watermark = json.loads(str(arrays['watermark']))
+        return selector, watermark
+
+
+def cached_chi2(csv_path, encoder, k=10, cache_path=None, x=None, y=None, chunksize=CHUNKSIZE):
+    """Chi2 selector for a growing CSV, updated only with rows appended since the last run.
+
+    If there is no usable cache and the full encoded x/y are already in
+    memory, they seed the statistics instead of re-reading the file.
+    """
+    cache_path = cache_path or os.path.join(os.path.dirname(os.path.abspath(csv_path)),
+                                            '.dataset_cache', os.path.basename(csv_path) + '.chi2.npz')
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    try:
+        selector, watermark = StreamingChi2.load(cache_path)
+        selector.k = k
+    except (OSError, ValueError, KeyError):
+        selector, watermark = None, None
+    if not is_valid_watermark(csv_path, watermark):
+        selector, watermark = StreamingChi2(k), None
+
+    chunks, new_watermark = read_appended(csv_path, watermark, chunksize)
+    if watermark is None and x is not None:
+        # Fresh start with the data in hand: seed from memory, skip the parse
+        selector.partial_fit(x, y)
+        new_watermark['rows'] = len(y)
+    else:
+        for chunk in chunks:
+            features = chunk.drop(columns=[TARGET])
+            selector.partial_fit(encoder.transform(features), encode_target(chunk[TARGET]))
+    selector.save(cache_path, new_watermark)
+    return selector
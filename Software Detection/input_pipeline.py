@@ -0,0 +1,103 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+#============================= TF.DATA INPUT PIPELINE ===================
+#
+# The ANN used to be fed pandas frames, which Keras converted again on every
+# epoch. Here the float32 arrays are turned into a tf.data pipeline once:
+#   from_tensor_slices -> cache -> shuffle -> batch -> prefetch(AUTOTUNE)
+#
+# Thread counts for CPU-only boxes come from arguments or the environment:
+#   TF_INTRA_OP_THREADS   threads used inside one op (matmul etc.)
+#   TF_INTER_OP_THREADS   ops run concurrently
+#   TF_DATA_THREADS       private thread pool of the tf.data pipeline
+
+
+def _env_int(name):
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+def configure_threads(intra_op=None, inter_op=None):
+    """Set TensorFlow's op thread pools; must run before TensorFlow executes anything."""
+    import tensorflow as tf
+    intra_op = intra_op or _env_int('TF_INTRA_OP_THREADS')
+    inter_op = inter_op or _env_int('TF_INTER_OP_THREADS')
+    try:
+        if intra_op:
+            tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+        if inter_op:
+            tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+    except RuntimeError:
+        # The runtime is already initialized in this process; keep its settings
+        pass
+
+
+def make_dataset(x, y, batch_size, shuffle=True, seed=1, cache=True, threads=None):
+    """Batched tf.data.Dataset over float32 copies of x and y."""
+    import tensorflow as tf
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    y = np.ascontiguousarray(y, dtype=np.float32)
+    dataset = tf.data.Dataset.from_tensor_slices((x, y))
+    if cache:
+        dataset = dataset.cache()
+    if shuffle:
+        dataset = dataset.shuffle(len(x), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+    threads = threads or _env_int('TF_DATA_THREADS')
+    if threads:
+        options = tf.data.Options()
+        options.threading.private_threadpool_size = threads
+        dataset = dataset.with_options(options)
+    return dataset
+
+
+#============================= THROUGHPUT BENCHMARK =====================
+
+def benchmark(x, y, batch_sizes, epochs=5, threads=None):
+    """Train the defect ANN per batch size and report samples/sec for each epoch."""
+    from tensorflow.keras.callbacks import Callback
+    from model_runner import build_ann, fit_input_scaler
+
+    class EpochTimer(Callback):
+        def on_epoch_begin(self, epoch, logs=None):
+            self.start = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            self.times.append(time.perf_counter() - self.start)
+
+    results = []
+    for batch_size in batch_sizes:
+        model, _ = build_ann(x.shape[1], epochs=epochs, batch_size=batch_size)
+        fit_input_scaler(model, x)
+        timer = EpochTimer()
+        timer.times = []
+        model.fit(make_dataset(x, y, batch_size, threads=threads), epochs=epochs, verbose=0, callbacks=[timer])
+        rates = [len(x) / t for t in timer.times]
+        results.append((batch_size, rates))
+        # Epoch 1 includes tracing and filling the cache
+        print(f"batch_size={batch_size:>6}  " + "  ".join(f"{rate:>10,.0f}" for rate in rates)
+              + f"   steady {np.mean(rates[1:] or rates):,.0f} samples/sec")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ANN training throughput per batch size")
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1000, 4096])
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--intra', type=int, help="intra-op threads")
+    parser.add_argument('--inter', type=int, help="inter-op threads")
+    parser.add_argument('--data-threads', type=int, help="tf.data private thread pool size")
+    args = parser.parse_args()
+
+    configure_threads(args.intra, args.inter)
+
+    from dataset_cache import load_cached
+    from Main import encode
+    dataset = load_cached("Data.csv", encode, encoding="defect-encoder")
+    print(f"samples/sec per epoch ({len(dataset.y)} samples):")
+    benchmark(dataset.x, dataset.y, args.batch_sizes, args.epochs, args.data_threads)
@@ -0,0 +1,122 @@
+import itertools
+import queue
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+#============================= BACKGROUND JOBS ==========================
+#
+# Jobs run on worker threads and never touch Tk. They report through a
+# queue.Queue that the Tk thread drains with root.after(), so the event loop
+# stays responsive; every UI callback therefore runs on the Tk thread.
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, job_id, name, events):
+        self.id = job_id
+        self.name = name
+        self.state = 'queued'
+        self._events = events
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check_cancelled(self):
+        """Raise JobCancelled if cancel() was requested; call between stages."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, kind, **data):
+        """Send a progress event to the UI thread (thread-safe)."""
+        self._events.put((self, kind, data))
+
+
+class JobQueue:
+    """Run functions on worker threads and deliver their events to Tk.
+
+    submit(name, func, *args) calls func(job, *args) on a worker; extra jobs
+    wait their turn. on_event(job, kind, data) is called on the Tk thread with
+    kind 'started', 'done' (data['result']), 'error' (data['error']),
+    'cancelled', or any custom kind the job reports (e.g. 'epoch').
+    """
+
+    def __init__(self, root, on_event, max_workers=1, poll_ms=100):
+        self.root = root
+        self.on_event = on_event
+        self.poll_ms = poll_ms
+        self.jobs = {}
+        self._events = queue.Queue()
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, name, func, *args):
+        job = Job(next(self._ids), name, self._events)
+        self.jobs[job.id] = job
+        self._executor.submit(self._run, job, func, args)
+        return job
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.cancel()
+
+    def shutdown(self):
+        for job in self.jobs.values():
+            job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, func, args):
+        if job.cancelled:
+            job.report('cancelled')
+            return
+        job.report('started')
+        try:
+            result = func(job, *args)
+        except JobCancelled:
+            job.report('cancelled')
+        except Exception as error:
+            job.report('error', error=error, traceback=traceback.format_exc())
+        else:
+            job.report('cancelled' if job.cancelled else 'done', result=result)
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    job, kind, data = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                if kind in ('started', 'done', 'error', 'cancelled'):
+                    job.state = kind
+                try:
+                    self.on_event(job, kind, data)
+                except Exception:
+                    # A failing UI callback must not stop delivery of later events
+                    traceback.print_exc()
+        finally:
+            self.root.after(self.poll_ms, self._poll)
+
+
+def keras_progress(job, epochs):
+    """Keras callback reporting per-epoch progress and honouring cancellation."""
+    from tensorflow.keras.callbacks import Callback
+
+    class JobProgress(Callback):
+        def on_train_batch_end(self, batch, logs=None):
+            if job.cancelled:
+                self.model.stop_training = True
+
+        def on_epoch_end(self, epoch, logs=None):
+            job.report('epoch', epoch=epoch + 1, epochs=epochs, logs=dict(logs or {}))
+
+    return JobProgress()
@@ -0,0 +1,145 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+#============================= CANDIDATE MODELS =========================
+
+# Each builder runs inside the worker process, so heavy imports (TensorFlow)
+# only happen in the worker that needs them. Builders return (model, fit kwargs).
+
+
+def build_ann(input_dim, units=(8, 14), epochs=10, batch_size=1000):
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense, Input, Normalization
+    classifier = Sequential()
+    classifier.add(Input(shape=(input_dim,)))
+    # Standardizes the raw metrics (column maxima around 1e7), as the linear
+    # models' StandardScaler does; fitted by fit_input_scaler()
+    classifier.add(Normalization())
+    classifier.add(Dense(activation="relu", units=units[0], kernel_initializer="uniform"))
+    classifier.add(Dense(activation="relu", units=units[1], kernel_initializer="uniform"))
+    classifier.add(Dense(activation="sigmoid", units=1, kernel_initializer="uniform"))
+    classifier.compile(optimizer='adam', loss='mae', metrics=['mae', 'accuracy'])
+    return classifier, {'batch_size': batch_size, 'epochs': epochs, 'verbose': 0}
+
+
+def fit_input_scaler(model, x):
+    """Fit the ANN's Normalization layer to the mean/variance of x; it stays fixed afterwards."""
+    model.layers[0].adapt(np.asarray(x, dtype=np.float32))
+
+
+def build_linear_svm(input_dim, C=.1):
+    # Linear solver scales to the full training set (SVC was limited to 200 rows)
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import LinearSVC
+    return make_pipeline(StandardScaler(), LinearSVC(C=C, dual='auto', max_iter=5000)), {}
+
+
+def build_sgd(input_dim, alpha=1e-4):
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.linear_model import SGDClassifier
+    return make_pipeline(StandardScaler(), SGDClassifier(loss='hinge', alpha=alpha, random_state=1)), {}
+
+
+MODELS = {
+    'ann': build_ann,
+    'linear_svm': build_linear_svm,
+    'sgd': build_sgd,
+}
+
+LABELS = {'ann': 'ANN', 'linear_svm': 'SVM (linear)', 'sgd': 'SGD'}
+
+# Score at or above which a module is predicted defective: the ANN's sigmoid
+# output, the linear models' decision function
+THRESHOLDS = {'ann': 0.5, 'linear_svm': 0.0, 'sgd': 0.0}
+
+
+#============================= WORKER ===================================
+
+def _peak_rss_mb():
+    if resource is None:
+        return float('nan')
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if os.uname().sysname == 'Darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def run_model(name, x_train, y_train, x_test, y_test, params=None, save_dir=None):
+    """Fit and score one model; returns timings, peak memory, predictions and scores.
+
+    Predictions are the scores thresholded at THRESHOLDS[name].
+
+    With save_dir the trained model is also written there (see model_store).
+    """
+    if name == 'ann':
+        from input_pipeline import configure_threads
+        configure_threads()
+    model, fit_kwargs = MODELS[name](x_train.shape[1], **(params or {}))
+
+    start = time.perf_counter()
+    if name == 'ann':
+        # Feed Keras a cached, prefetched tf.data pipeline instead of raw arrays
+        from input_pipeline import make_dataset
+        fit_input_scaler(model, x_train)
+        batch_size = fit_kwargs.pop('batch_size')
+        model.fit(make_dataset(x_train, y_train, batch_size), **fit_kwargs)
+    else:
+        model.fit(x_train, y_train, **fit_kwargs)
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if name == 'ann':
+        scores = model.predict(x_test, verbose=0).reshape(-1)
+    else:
+        scores = model.decision_function(x_test)
+    y_pred = (scores >= THRESHOLDS[name]).astype(np.int8)
+    predict_time = time.perf_counter() - start
+
+    if save_dir:
+        from model_store import save_model
+        save_model(model, name, save_dir)
+
+    return {
+        'model': name,
+        'accuracy': float(np.mean(y_pred == np.asarray(y_test))) * 100,
+        'fit_s': fit_time,
+        'predict_s': predict_time,
+        'peak_rss_mb': _peak_rss_mb(),
+        'y_pred': y_pred,
+        'scores': scores.astype(np.float32),
+    }
+
+
+#============================= ENGINE ===================================
+
+def run_models(names, x_train, y_train, x_test, y_test, params=None, max_workers=None, save_dir=None):
+    """Train the candidate models concurrently, one fresh process per model.
+
+    Returns (comparison table, {name: test predictions}, {name: test scores}).
+    A fresh process per model keeps each peak RSS figure specific to that
+    model. Workers are spawned, so callers must guard their entry point with
+    __main__.
+    """
+    params = params or {}
+    x_train, x_test = np.asarray(x_train, dtype=np.float32), np.asarray(x_test, dtype=np.float32)
+    y_train, y_test = np.asarray(y_train), np.asarray(y_test)
+
+    with ProcessPoolExecutor(max_workers=max_workers or len(names), max_tasks_per_child=1) as executor:
+        futures = [executor.submit(run_model, name, x_train, y_train, x_test, y_test, params.get(name), save_dir)
+                   for name in names]
+        results = [future.result() for future in futures]
+
+    predictions = {result['model']: result.pop('y_pred') for result in results}
+    scores = {result['model']: result.pop('scores') for result in results}
+    table = pd.DataFrame(results).set_index('model')
+    return table, predictions, scores
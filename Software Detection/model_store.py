@@ -0,0 +1,173 @@
+import json
+import os
+import pickle
+
+import numpy as np
+
+from atomic_io import replacing, write_json, write_pickle
+
+#============================= MODEL ARTIFACTS ==========================
+#
+# artifacts/
+#   preprocess.pkl      fitted DefectEncoder, chi2 selector, model feature indices,
+#                       watermark of the training rows in Data.csv
+#   <name>.keras        full Keras model (for retraining / warm starts)
+#   <name>.npz          input mean/scale and dense-layer weights, scored with NumPy (no TensorFlow)
+#   <name>.pkl          pickled scikit-learn models
+#   update.pending      present only while save_update() moves files into place
+
+ARTIFACT_DIR = 'artifacts'
+UPDATE_MARKER = 'update.pending'
+
+
+def _dense_arrays(model):
+    # Dense stack exported for TensorFlow-free scoring
+    arrays = {}
+    activations = []
+    for layer in model.layers:
+        if type(layer).__name__ == 'Normalization':
+            # Same transform as Keras: (x - mean) / max(sqrt(variance), epsilon)
+            mean, variance = layer.get_weights()[:2]
+            arrays['mean'], arrays['scale'] = mean, np.maximum(np.sqrt(variance), 1e-7)
+            continue
+        i = len(activations)
+        arrays[f'kernel_{i}'], arrays[f'bias_{i}'] = layer.get_weights()
+        activations.append(layer.get_config()['activation'])
+    arrays['activations'] = np.array(activations)
+    return arrays
+
+
+def _model_files(model, name):
+    """(file name, write(path)) pairs that persist one model."""
+    if hasattr(model, 'layers'):
+        return [(name + '.keras', model.save),
+                (name + '.npz', lambda path: np.savez(path, **_dense_arrays(model)))]
+    return [(name + '.pkl', lambda path: write_pickle(model, path))]
+
+
+def _preprocessing_state(encoder, selector=None, feature_idx=None, watermark=None):
+    if feature_idx is None:
+        feature_idx = np.arange(len(encoder.feature_names_))
+    return {'encoder': encoder, 'selector': selector, 'feature_idx': np.asarray(feature_idx),
+            'watermark': watermark}
+
+
+def save_model(model, name, artifact_dir=ARTIFACT_DIR):
+    """Save a trained Keras or scikit-learn model under artifact_dir."""
+    os.makedirs(artifact_dir, exist_ok=True)
+    for file_name, write in _model_files(model, name):
+        with replacing(os.path.join(artifact_dir, file_name)) as tmp_path:
+            write(tmp_path)
+
+
+def save_preprocessing(encoder, selector=None, feature_idx=None, artifact_dir=ARTIFACT_DIR, watermark=None):
+    """Save the fitted encoder and feature-selection state used at training time.
+
+    watermark (see data_loader.read_appended) marks the rows the models have
+    seen, for online_update.py.
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+    state = _preprocessing_state(encoder, selector, feature_idx, watermark)
+    write_pickle(state, os.path.join(artifact_dir, 'preprocess.pkl'))
+
+
+def save_update(models, encoder, selector=None, feature_idx=None, artifact_dir=ARTIFACT_DIR, watermark=None):
+    """Replace several {name: model} artifacts and preprocess.pkl as one all-or-nothing update.
+
+    Every file is first written under a staging name. Then the UPDATE_MARKER
+    file, which lists the staged files, is written atomically, and the files
+    are moved into place. If the process dies before the marker exists, the
+    old artifacts are untouched. If it dies after, the next load finishes
+    the moves. Either way the models never run ahead of the watermark.
+    """
+    files = [item for name, model in models.items() for item in _model_files(model, name)]
+    state = _preprocessing_state(encoder, selector, feature_idx, watermark)
+    files.append(('preprocess.pkl', lambda path: write_pickle(state, path)))
+    staged = []
+    try:
+        for file_name, write in files:
+            root, ext = os.path.splitext(file_name)
+            staged_name = f"{root}.staged{ext}"
+            staged.append([staged_name, file_name])
+            write(os.path.join(artifact_dir, staged_name))
+    except BaseException:
+        for staged_name, _ in staged:
+            if os.path.exists(os.path.join(artifact_dir, staged_name)):
+                os.remove(os.path.join(artifact_dir, staged_name))
+        raise
+    write_json(staged, os.path.join(artifact_dir, UPDATE_MARKER))
+    finish_update(artifact_dir)
+
+
+def finish_update(artifact_dir=ARTIFACT_DIR):
+    """Complete an update interrupted after its marker was written; a no-op otherwise."""
+    marker = os.path.join(artifact_dir, UPDATE_MARKER)
+    try:
+        with open(marker, 'r') as file:
+            staged = json.load(file)
+    except FileNotFoundError:
+        return
+    for staged_name, file_name in staged:
+        staged_path = os.path.join(artifact_dir, staged_name)
+        if os.path.exists(staged_path):
+            os.replace(staged_path, os.path.join(artifact_dir, file_name))
+    os.remove(marker)
+
+
+def load_preprocessing(artifact_dir=ARTIFACT_DIR):
+    finish_update(artifact_dir)
+    with open(os.path.join(artifact_dir, 'preprocess.pkl'), 'rb') as file:
+        return pickle.load(file)
+
+
+#============================= SCORING ==================================
+
+_ACTIVATIONS = {
+    'relu': lambda z: np.maximum(z, 0, out=z),
+    'sigmoid': lambda z: 0.5 * (1 + np.tanh(0.5 * z)),  # overflow-free logistic
+    'linear': lambda z: z,
+}
+
+
+class DenseScorer:
+    """NumPy forward pass over exported Dense weights."""
+
+    def __init__(self, path):
+        with np.load(path) as arrays:
+            activations = [str(a) for a in arrays['activations']]
+            self.layers = [(arrays[f'kernel_{i}'], arrays[f'bias_{i}'], _ACTIVATIONS[activation])
+                           for i, activation in enumerate(activations)]
+            # Input standardization; absent in artifacts saved before it existed
+            self.mean = arrays['mean'] if 'mean' in arrays.files else None
+            self.scale = arrays['scale'] if 'scale' in arrays.files else None
+
+    def predict_scores(self, x):
+        out = np.asarray(x, dtype=np.float32)
+        if self.mean is not None:
+            out = (out - self.mean) / self.scale
+        for kernel, bias, activation in self.layers:
+            out = activation(out @ kernel + bias)
+        return out.reshape(-1)
+
+
+class SklearnScorer:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.model = pickle.load(file)
+
+    def predict_scores(self, x):
+        # Same score as training (model_runner.run_model), so THRESHOLDS apply
+        if hasattr(self.model, 'decision_function'):
+            return self.model.decision_function(x)
+        if hasattr(self.model, 'predict_proba'):
+            return self.model.predict_proba(x)[:, 1]
+        return self.model.predict(x).astype(np.float32)
+
+
+def load_scorer(name, artifact_dir=ARTIFACT_DIR):
+    """Load a saved model for scoring; Keras models are scored without TensorFlow."""
+    finish_update(artifact_dir)
+    dense_path = os.path.join(artifact_dir, name + '.npz')
+    if os.path.exists(dense_path):
+        return DenseScorer(dense_path)
+    return SklearnScorer(os.path.join(artifact_dir, name + '.pkl'))
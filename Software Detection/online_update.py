@@ -0,0 +1,103 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from data_loader import CHUNKSIZE, TARGET, is_valid_watermark, read_appended
+from feature_encoder import encode_target
+from model_store import ARTIFACT_DIR, load_preprocessing, save_update
+
+#============================= ONLINE UPDATES ===========================
+#
+# Main.py trains from scratch and stores a watermark into Data.csv with the
+# preprocessing state. This module reads only the rows appended after that
+# watermark and folds them into the saved artifacts:
+#   sgd   SGDClassifier.partial_fit (one pass over the new rows)
+#   ann   the saved Keras model continues training for a few epochs
+# The encoder and the model's feature columns stay fixed, since the models'
+# inputs depend on them; the chi2 statistics are updated for the next full
+# retrain. LinearSVC has no partial_fit and is left for Main.py.
+
+INCREMENTAL_MODELS = ('ann', 'sgd')
+
+
+def _partial_fit_sgd(path, x, y):
+    import pickle
+    with open(path, 'rb') as file:
+        model = pickle.load(file)
+    # The scaler stays as fitted so the learned weights keep their meaning
+    scaler, classifier = model[0], model[-1]
+    classifier.partial_fit(scaler.transform(x), y, classes=np.array([0, 1]))
+    return model
+
+
+def _continue_ann(path, x, y, epochs, batch_size):
+    from tensorflow.keras.models import load_model
+    from input_pipeline import configure_threads, make_dataset
+    configure_threads()
+    model = load_model(path)
+    model.fit(make_dataset(x, y, batch_size), epochs=epochs, verbose=0)
+    return model
+
+
+def update(csv_path, artifact_dir=ARTIFACT_DIR, models=INCREMENTAL_MODELS, epochs=3, batch_size=1000,
+           chunksize=CHUNKSIZE):
+    """Update the saved models with the rows appended to csv_path since the stored watermark.
+
+    Returns the number of new rows. Raises ValueError if the artifacts have
+    no watermark or the file was rewritten, in which case Main.py has to
+    retrain from scratch.
+    """
+    state = load_preprocessing(artifact_dir)
+    watermark = state.get('watermark')
+    if not is_valid_watermark(csv_path, watermark):
+        raise ValueError(f"{csv_path} no longer extends the data the artifacts were trained on; "
+                         "retrain with Main.py")
+    encoder, selector, feature_idx = state['encoder'], state['selector'], state['feature_idx']
+
+    start = time.perf_counter()
+    chunks, new_watermark = read_appended(csv_path, watermark, chunksize)
+    xs, ys = [], []
+    for chunk in chunks:
+        x = encoder.transform(chunk.drop(columns=[TARGET]))
+        y = encode_target(chunk[TARGET])
+        if selector is not None:
+            selector.partial_fit(x, y)
+        xs.append(x[:, feature_idx])
+        ys.append(y)
+    n_rows = new_watermark['rows'] - watermark['rows']
+    if not n_rows:
+        print("No new rows since the last update")
+        return 0
+    x, y = np.concatenate(xs), np.concatenate(ys)
+
+    updated = {}
+    for name in models:
+        model_start = time.perf_counter()
+        if name == 'sgd':
+            updated[name] = _partial_fit_sgd(os.path.join(artifact_dir, 'sgd.pkl'), x, y)
+        elif name == 'ann':
+            updated[name] = _continue_ann(os.path.join(artifact_dir, 'ann.keras'), x, y, epochs, batch_size)
+        else:
+            raise ValueError(f"{name!r} cannot be updated incrementally; choose from {INCREMENTAL_MODELS}")
+        print(f"  {name:<4} updated in {time.perf_counter() - model_start:.2f}s")
+
+    # Models and watermark are replaced together: if anything fails, none of
+    # them changes and the same rows are offered again next time
+    save_update(updated, encoder, selector, feature_idx, artifact_dir, watermark=new_watermark)
+    print(f"Updated {', '.join(models)} with {n_rows} new rows in {time.perf_counter() - start:.2f}s "
+          f"({new_watermark['rows']} rows seen in total)")
+    return n_rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fold rows appended to Data.csv into the saved models")
+    parser.add_argument('input', nargs='?', default="Data.csv")
+    parser.add_argument('--artifacts', default=ARTIFACT_DIR)
+    parser.add_argument('--models', nargs='+', default=list(INCREMENTAL_MODELS), choices=INCREMENTAL_MODELS)
+    parser.add_argument('--epochs', type=int, default=3, help="extra ANN epochs over the new rows")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    update(args.input, args.artifacts, args.models, args.epochs, args.batch_size)
@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from atomic_io import replacing
+
+#============================= FIGURE RENDERING =========================
+#
+# Every chart is drawn by a function taking an Axes, so the same code serves
+# interactive windows (pyplot) and headless runs. Headless rendering uses the
+# Agg canvas directly, without pyplot: each process keeps one Figure per
+# chart kind and clears it between renders instead of creating new ones, so
+# memory stays flat however many figures a run writes.
+
+REPORT_DIR = 'reports'
+FORMATS = ('png', 'svg')
+
+
+def draw_confusion(ax, cm, title, cbar_ax=None):
+    import seaborn as sns
+    sns.heatmap(cm, annot=True, fmt='d', ax=ax, cbar_ax=cbar_ax)
+    ax.set_title(title)
+
+
+def draw_comparison(ax, labels, values, title='Comparison graph'):
+    inds = range(len(values))
+    ax.bar(inds, values)
+    ax.set_xticks(list(inds))
+    ax.set_xticklabels(labels)
+    ax.set_title(title)
+
+
+def draw_history(ax, history, title):
+    ax.plot(history['accuracy'])
+    ax.set_xlabel('epoch')
+    ax.set_ylabel('accuracy')
+    ax.set_title(title)
+
+
+DRAW = {
+    'confusion': draw_confusion,
+    'comparison': draw_comparison,
+    'history': draw_history,
+}
+
+
+#============================= HEADLESS RENDERING =======================
+
+_figures = {}
+
+
+def _figure(kind):
+    """(figure, axes) reused for every render of kind in this process, cleared."""
+    if kind not in _figures:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=(6.4, 4.8))
+        FigureCanvasAgg(fig)
+        if kind == 'confusion':
+            # Heatmaps get a fixed colorbar axes so nothing is added per render
+            ax = fig.add_axes([0.1, 0.1, 0.65, 0.8])
+            axes = (ax, fig.add_axes([0.8, 0.1, 0.04, 0.8]))
+        else:
+            axes = (fig.add_subplot(),)
+        _figures[kind] = (fig, axes)
+    fig, axes = _figures[kind]
+    for ax in axes:
+        ax.clear()
+    return fig, axes
+
+
+def render(kind, args, path, formats=FORMATS):
+    """Draw one figure with DRAW[kind](ax, *args) and save it as path.<format>."""
+    fig, axes = _figure(kind)
+    if kind == 'confusion':
+        DRAW[kind](axes[0], *args, cbar_ax=axes[1])
+    else:
+        DRAW[kind](axes[0], *args)
+    written = []
+    for fmt in formats:
+        target = f"{path}.{fmt}"
+        with replacing(target) as tmp_path:
+            fig.savefig(tmp_path)
+        written.append(target)
+    return written
+
+
+def render_all(figures, report_dir=REPORT_DIR, formats=FORMATS, max_workers=None):
+    """Render (kind, args, name) figures into report_dir concurrently.
+
+    Figures are spread over a process pool; a single figure (or
+    max_workers=1) is rendered in the calling thread. Returns the written
+    paths in input order.
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    tasks = [(kind, args, os.path.join(report_dir, name), formats) for kind, args, name in figures]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if max_workers <= 1:
+        return [path for task in tasks for path in render(*task)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(render, *task) for task in tasks]
+        return [path for future in futures for path in future.result()]
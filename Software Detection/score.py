@@ -0,0 +1,80 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from data_loader import TARGET, read_chunks
+from feature_encoder import encode_target
+from model_runner import THRESHOLDS
+from model_store import ARTIFACT_DIR, load_preprocessing, load_scorer
+
+# Lightweight batch scoring: loads the saved encoder, feature selection and
+# model (no TensorFlow import for the ANN) and streams predictions for a CSV
+# in fixed-size batches, appending each batch to the output file.
+
+
+def score_file(input_path, output_path, model='ann', artifact_dir=ARTIFACT_DIR, batch_size=50_000, threshold=None,
+               summary_path=None):
+    """Score input_path into output_path; returns the number of rows.
+
+    threshold defaults to the model's training threshold (model_runner.THRESHOLDS).
+
+    With summary_path and a defects column in the input, the scores are also
+    evaluated against it (see evaluation.py) and written to
+    summary_path.json/.csv.
+    """
+    state = load_preprocessing(artifact_dir)
+    encoder, feature_idx = state['encoder'], state['feature_idx']
+    scorer = load_scorer(model, artifact_dir)
+    if threshold is None:
+        threshold = THRESHOLDS.get(model, 0.5)
+
+    rows = 0
+    all_scores, labels = [], []
+    start = time.perf_counter()
+    with open(output_path, 'w', newline='') as out:
+        out.write("row,score,prediction\n")
+        for chunk in read_chunks(input_path, chunksize=batch_size):
+            features = chunk.drop(columns=[TARGET], errors='ignore')
+            x = encoder.transform(features)[:, feature_idx]
+            scores = scorer.predict_scores(x)
+            if summary_path and TARGET in chunk:
+                all_scores.append(scores.astype(np.float32))
+                labels.append(encode_target(chunk[TARGET]))
+            index = np.arange(rows, rows + len(scores))
+            np.savetxt(out, np.column_stack([index, scores, scores >= threshold]),
+                       fmt=['%d', '%.6f', '%d'], delimiter=',')
+            rows += len(scores)
+            elapsed = time.perf_counter() - start
+            print(f"\rScored {rows} rows ({rows / elapsed:,.0f} rows/sec)", end='', file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    print(f"\nScored {rows} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec) -> {output_path}",
+          file=sys.stderr)
+
+    if summary_path and labels:
+        from evaluation import evaluate, write_summary
+        all_scores = np.concatenate(all_scores)
+        if len(np.unique(all_scores)) <= 2:
+            # e.g. a model with neither decision_function nor predict_proba
+            print(f"Warning: {model} produced hard labels, not scores; ROC/PR areas and best thresholds "
+                  "are not meaningful", file=sys.stderr)
+        summary = evaluate(np.concatenate(labels), all_scores, threshold)
+        for path in write_summary({model: summary}, summary_path):
+            print(f"Evaluation -> {path}", file=sys.stderr)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a Data.csv-format file with saved defect-model artifacts")
+    parser.add_argument('input', help="CSV with the metric columns (defects column optional)")
+    parser.add_argument('output', help="CSV to write row,score,prediction to")
+    parser.add_argument('--model', default='ann', help="saved model name (ann, linear_svm, sgd)")
+    parser.add_argument('--artifacts', default=ARTIFACT_DIR)
+    parser.add_argument('--batch-size', type=int, default=50_000)
+    parser.add_argument('--threshold', type=float, help="prediction cutoff (default: the model's training threshold)")
+    parser.add_argument('--summary', help="evaluate against the defects column and write SUMMARY.json/.csv")
+    args = parser.parse_args()
+
+    score_file(args.input, args.output, args.model, args.artifacts, args.batch_size, args.threshold, args.summary)
@@ -0,0 +1,74 @@
+import threading
+import time
+import types
+
+#============================= STARTUP TIMERS ===========================
+
+_T0 = time.perf_counter()
+_marks = []
+
+
+def mark(name):
+    """Record the time elapsed since this module was imported under name."""
+    _marks.append((name, time.perf_counter() - _T0))
+
+
+def report(file=None):
+    """Print the recorded marks (cumulative and per-step seconds)."""
+    print("Startup timings:", file=file)
+    previous = 0.0
+    for name, elapsed in _marks:
+        print(f"  {name:<28} {elapsed:8.3f}s  (+{elapsed - previous:.3f}s)", file=file)
+        previous = elapsed
+
+
+#============================= LAZY ML STACK ============================
+#
+# TensorFlow, scikit-learn, pandas and the pipeline modules built on them
+# take seconds to import. They are loaded on first use via ml(), or ahead of
+# time by warm_up() on a background thread once the user has logged in.
+
+_lock = threading.Lock()
+_stack = None
+
+
+def _load():
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense, Input, Normalization
+    import data_loader
+    import feature_encoder
+    from feature_selection import StreamingChi2
+    from input_pipeline import configure_threads, make_dataset
+    configure_threads()
+    return types.SimpleNamespace(
+        pd=pd, StreamingChi2=StreamingChi2, train_test_split=train_test_split,
+        Sequential=Sequential, Dense=Dense, Input=Input, Normalization=Normalization, make_dataset=make_dataset,
+        data_loader=data_loader, feature_encoder=feature_encoder,
+    )
+
+
+def ml():
+    """Return the ML stack namespace, importing it on first call (thread-safe)."""
+    global _stack
+    if _stack is None:
+        with _lock:
+            if _stack is None:
+                start = time.perf_counter()
+                _stack = _load()
+                mark(f"ml stack loaded ({time.perf_counter() - start:.2f}s)")
+    return _stack
+
+
+def pyplot():
+    """matplotlib.pyplot, imported on first use (call from the Tk thread)."""
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def warm_up():
+    """Start importing the ML stack on a daemon thread; returns the thread."""
+    thread = threading.Thread(target=ml, name='ml-warm-up', daemon=True)
+    thread.start()
+    return thread
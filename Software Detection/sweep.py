@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from atomic_io import write_json
+from model_runner import LABELS, MODELS, run_model
+
+#============================= SEARCH SPACES ============================
+#
+# Keyword arguments of the model_runner builders. The linear SVM replaced
+# SVC(kernel='linear', gamma=1), so only C is searched (gamma has no effect
+# on a linear kernel).
+
+SPACES = {
+    'ann': {
+        'units': [(8, 14), (16, 32), (32, 64)],
+        'batch_size': [100, 1000],
+        'epochs': [10, 20],
+    },
+    'linear_svm': {
+        'C': [.001, .01, .1, 1, 10],
+    },
+    'sgd': {
+        'alpha': [1e-6, 1e-5, 1e-4, 1e-3, 1e-2],
+    },
+}
+
+SWEEP_DIR = os.path.join('.dataset_cache', 'sweep')
+
+
+def grid(space):
+    """Every combination of the values in space, as a list of dicts."""
+    keys = sorted(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def sample(space, n, seed=0):
+    """n distinct random configurations from space (all of them if fewer exist)."""
+    configs = grid(space)
+    return random.Random(seed).sample(configs, min(n, len(configs)))
+
+
+#============================= RESULT MEMO ==============================
+#
+# One JSON file per (model, config, training rows, data hash). The data hash
+# covers the train/validation arrays, so changing Data.csv, the feature
+# selection or the split invalidates old results automatically.
+
+def data_hash(*arrays):
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def _memo_path(memo_dir, name, config, n_rows, digest):
+    key = json.dumps([name, config, n_rows, digest], sort_keys=True)
+    return os.path.join(memo_dir, f"{name}-{hashlib.sha256(key.encode()).hexdigest()[:24]}.json")
+
+
+def _read_memo(path):
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+#============================= SWEEP ENGINE =============================
+
+def _evaluate(name, config, n_rows, x_train, y_train, x_val, y_val):
+    result = run_model(name, x_train[:n_rows], y_train[:n_rows], x_val, y_val, params=config)
+    return {'config': config, 'rows': n_rows, 'accuracy': result['accuracy'], 'fit_s': result['fit_s']}
+
+
+class Sweep:
+    """Evaluates configurations of one model in parallel with on-disk memoization.
+
+    x_train/y_train should be shuffled (train_test_split does this): rungs of
+    successive halving train on prefixes of them. Scores are validation
+    accuracy; keep the test split out of the sweep.
+    """
+
+    def __init__(self, name, x_train, y_train, x_val, y_val, memo_dir=SWEEP_DIR, max_workers=None):
+        if name not in MODELS:
+            raise ValueError(f"unknown model {name!r}; choose from {sorted(MODELS)}")
+        self.name = name
+        self.data = (np.asarray(x_train, dtype=np.float32), np.asarray(y_train),
+                     np.asarray(x_val, dtype=np.float32), np.asarray(y_val))
+        self.digest = data_hash(*self.data)
+        self.memo_dir = memo_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.hits = 0
+        self.computed = 0
+        os.makedirs(memo_dir, exist_ok=True)
+
+    def evaluate(self, configs, n_rows=None):
+        """Results for configs trained on the first n_rows rows (default: all), in input order."""
+        n_rows = min(n_rows or len(self.data[1]), len(self.data[1]))
+        # JSON round-trips tuples as lists; normalise so memo keys are stable
+        configs = [json.loads(json.dumps(config)) for config in configs]
+        paths = [_memo_path(self.memo_dir, self.name, config, n_rows, self.digest) for config in configs]
+        results = [_read_memo(path) for path in paths]
+        todo = [i for i, result in enumerate(results) if result is None]
+        self.hits += len(configs) - len(todo)
+        if todo:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(todo))) as executor:
+                futures = {i: executor.submit(_evaluate, self.name, configs[i], n_rows, *self.data) for i in todo}
+                for i, future in futures.items():
+                    results[i] = future.result()
+                    write_json(results[i], paths[i])
+            self.computed += len(todo)
+        return results
+
+    def successive_halving(self, configs, eta=3, min_rows=500):
+        """Train all configs on min_rows rows, keep the best 1/eta, multiply rows by eta, repeat.
+
+        The last survivor is always scored on the full training set; returns
+        the results of that final rung, best first.
+        """
+        total = len(self.data[1])
+        n_rows = min(min_rows, total)
+        while True:
+            results = sorted(self.evaluate(configs, n_rows), key=lambda result: -result['accuracy'])
+            print(f"  rung: {len(configs):>3} configs on {n_rows:>6} rows, best {results[0]['accuracy']:.3f}%")
+            if n_rows >= total:
+                return results
+            configs = [result['config'] for result in results[:max(1, math.ceil(len(results) / eta))]]
+            n_rows = total if len(configs) == 1 else min(n_rows * eta, total)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hyperparameter sweep for the Main.py models")
+    parser.add_argument('--model', choices=sorted(MODELS), default='linear_svm')
+    parser.add_argument('--search', choices=['grid', 'random'], default='grid')
+    parser.add_argument('--n-iter', type=int, default=10, help="configurations sampled by --search random")
+    parser.add_argument('--halving', action='store_true', help="successive halving instead of full evaluation")
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--min-rows', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Same data preparation as Main.py, then a validation split off the training set
+    from sklearn.model_selection import train_test_split
+    from dataset_cache import load_cached
+    from feature_selection import cached_chi2
+    from Main import encode
+    dataset = load_cached("Data.csv", encode, encoding="defect-encoder")
+    selected = cached_chi2("Data.csv", dataset.encoder, k=10, x=dataset.x, y=dataset.y).selected()
+    x_train, _, y_train, _ = train_test_split(dataset.x[:, selected], dataset.y, test_size=0.3, random_state=1)
+    x_train, x_val, y_train, y_val = train_test_split(x_train, y_train, test_size=0.2, random_state=args.seed)
+
+    space = SPACES[args.model]
+    configs = grid(space) if args.search == 'grid' else sample(space, args.n_iter, args.seed)
+    sweep = Sweep(args.model, x_train, y_train, x_val, y_val, max_workers=args.workers)
+
+    print(f"{LABELS[args.model]}: {len(configs)} configurations")
+    start = time.perf_counter()
+    if args.halving:
+        results = sweep.successive_halving(configs, args.eta, args.min_rows)
+    else:
+        results = sorted(sweep.evaluate(configs), key=lambda result: -result['accuracy'])
+    elapsed = time.perf_counter() - start
+
+    print()
+    for result in results:
+        print(f"  {result['accuracy']:7.3f}%  rows={result['rows']:<6}  {result['config']}")
+    print()
+    print(f"{sweep.computed} evaluated, {sweep.hits} from cache, {elapsed:.1f}s")